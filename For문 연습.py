@@ -1,4 +1,8 @@
 import streamlit as st
+from tax_tables import get_table
+
+# 세율표 (tax_tables.json: 5천만 원 이하 6%, 7천만 원 이하 15%, 그 외 24%)
+PAYROLL_TABLE = get_table("payroll")
 
 # 제목
 st.title("💰 납세자 세금 계산기")
@@ -10,15 +14,6 @@ taxpayers = [
     {"name": "이영희", "income": 72000000}
 ]
 
-# 세율 계산 함수
-def calculate_tax(income):
-    if income <= 50000000:
-        return income * 0.06  # 6%
-    elif income <= 70000000:
-        return income * 0.15  # 15%
-    else:
-        return income * 0.24  # 24%
-
 # 납세자 데이터 표시
 st.subheader("📋 납세자 데이터")
 st.table(taxpayers)
@@ -26,6 +21,9 @@ st.table(taxpayers)
 # 버튼 클릭 시 세금 계산
 if st.button("세금 계산하기"):
     st.subheader("💵 계산 결과")
-    for person in taxpayers:
-        tax = calculate_tax(person["income"])
-        st.write(f"**{person['name']}**의 세금은 **{tax:,.0f}원** 입니다.")
+    # 전체 납세자를 한 번에 계산
+    incomes = [person["income"] for person in taxpayers]
+    taxes = PAYROLL_TABLE.flat_tax_won(incomes)
+    progressive = PAYROLL_TABLE.progressive_tax_won(incomes)
+    for person, tax, prog in zip(taxpayers, taxes, progressive):
+        st.write(f"**{person['name']}**의 세금은 **{tax:,.0f}원** 입니다. (누진 계산 시 {prog:,.0f}원)")
@@ -1,36 +1,146 @@
 import streamlit as st
 import pandas as pd
+import hashlib
+import tempfile
+import numpy as np
 from io import BytesIO
+from tax_engine import RateSweep
+from tax_tables import get_table
+from tax_excel import compact_dtypes, read_all_sheets, stream_tax_workbook
+
+# 세율표 (tax_tables.json)
+INCOME_LEVEL_TABLE = get_table("income_level")
 
 st.set_page_config(page_title="Income & Tax Comparison", layout="wide")
+
+# 인별 그래프는 이 행 수 이하일 때만 그림 (그 이상은 구간별 집계만 전송)
+MAX_PER_PERSON_CHART_ROWS = 1000
+
+
+# -------------------------------
+# 캐시 함수
+# -------------------------------
+@st.cache_resource(show_spinner="엑셀 파일을 읽는 중...", max_entries=8)
+def load_excel(content_hash, all_sheets, _content):
+    """업로드 내용 해시별로 한 번만 엑셀을 파싱하고 자료형을 줄여 둠 (세율을 바꿔도 다시 읽지 않음)
+
+    all_sheets=True 이면 모든 시트를 병렬로 읽어 name / income / sheet 표로 합친다.
+    """
+    skipped = []
+    if all_sheets:
+        df, skipped = read_all_sheets(_content)
+    else:
+        df = pd.read_excel(BytesIO(_content), engine='openpyxl')
+    return compact_dtypes(df) + (skipped,)
+
+
+@st.cache_resource(show_spinner="세율 시나리오 계산 중...", max_entries=4)
+def load_rate_sweep(content_hash, all_sheets, _incomes):
+    """0~50% (0.5% 간격) 모든 세율의 세금을 한 번에 계산해 캐시
+
+    all_sheets에 따라 읽은 행이 달라지므로 키에 함께 넣는다.
+    """
+    return RateSweep(_incomes, np.arange(0, 50.5, 0.5))
+
+
+@st.cache_data(show_spinner="엑셀 파일을 만드는 중...", max_entries=8)
+def to_excel_bytes(content_hash, all_sheets, tax_rate, _df):
+    """다운로드용 엑셀 직렬화 (파일 내용, 시트 선택, 세율이 같으면 재사용)"""
+    output = BytesIO()
+    _df.to_excel(output, index=False, engine='openpyxl')
+    return output.getvalue()
+
 st.title("💰 Income & Tax Comparison App")
 
 uploaded_file = st.file_uploader("📤 엑셀 파일을 업로드하세요 (.xls, .xlsx, .xlsm)", type=["xls", "xlsx", "xlsm"])
 
-if uploaded_file:
+streaming = st.checkbox("대용량 파일 스트리밍 모드 (미리보기·그래프 없이 메모리를 적게 사용)")
+all_sheets = st.checkbox(
+    "모든 시트 읽기 (지역별 시트를 병렬로 읽어 하나로 합침)",
+    disabled=streaming,
+    help="스트리밍 모드에서는 첫 번째 시트만 읽습니다.",
+)
+if streaming:
+    all_sheets = False
+    st.caption("ℹ️ 스트리밍 모드에서는 첫 번째 시트만 계산합니다.")
+
+if uploaded_file and streaming:
+    tax_rate = st.slider("세율 (%)", 0, 50, 10)
     try:
-        df = pd.read_excel(uploaded_file, engine='openpyxl')
+        # 결과를 메모리가 아닌 임시 파일에 묶음 단위로 기록
+        with tempfile.NamedTemporaryFile(suffix=".xlsx") as tmp:
+            with st.spinner("세금 계산 중..."):
+                total = stream_tax_workbook(uploaded_file, tmp.name, tax_rate)
+            st.success(f"✅ {total:,}행 계산 완료")
+            with open(tmp.name, "rb") as f:
+                st.download_button(
+                    label="📥 계산된 결과 다운로드 (Excel)",
+                    data=f,
+                    file_name="tax_calculated.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+    except KeyError:
+        st.error("❌ 'income' 열이 존재하지 않습니다. 엑셀 파일을 확인해주세요.")
+    except Exception as e:
+        st.error(f"파일을 불러오는 중 오류가 발생했습니다: {e}")
+elif uploaded_file:
+    try:
+        content = uploaded_file.getvalue()
+        content_hash = hashlib.sha256(content).hexdigest()
+        df, mem_before, mem_after, skipped = load_excel(content_hash, all_sheets, content)
+        if skipped:
+            st.warning(f"'income' 열을 찾지 못해 건너뛴 시트: {', '.join(skipped)}")
+        st.caption(f"🧠 메모리 사용량: {mem_before / 1e6:,.1f} MB → {mem_after / 1e6:,.1f} MB")
         st.subheader("📋 원본 데이터 미리보기")
         st.dataframe(df, use_container_width=True)
 
-        tax_rate = st.slider("세율 (%)", 0, 50, 10)
+        what_if = st.checkbox("🔎 세율 시나리오 분석 (0.5% 단위, 모든 세율을 미리 계산)")
+        if what_if:
+            tax_rate = st.slider("세율 (%)", 0.0, 50.0, 10.0, step=0.5)
+        else:
+            tax_rate = st.slider("세율 (%)", 0, 50, 10)
 
         if "income" in df.columns:
-            df["calculated_tax"] = df["income"] * (tax_rate / 100)
+            if what_if:
+                # 미리 계산한 행렬에서 세율에 해당하는 줄만 조회
+                sweep = load_rate_sweep(content_hash, all_sheets, df["income"].to_numpy(dtype=float, na_value=np.nan))
+                result = df.assign(calculated_tax=sweep.tax_at(tax_rate))
+
+                st.subheader("📈 세율별 총 세수")
+                st.metric("선택한 세율의 총 세수", f"{sweep.revenue_at(tax_rate):,.0f} 원")
+                st.line_chart(pd.DataFrame({"세율(%)": sweep.rates, "총 세수": sweep.revenue}).set_index("세율(%)"))
+            else:
+                # 캐시된 원본은 그대로 두고 세금 열만 새로 계산
+                result = df.assign(calculated_tax=df["income"] * (tax_rate / 100))
+
             st.subheader("💵 세금 계산 결과")
-            st.dataframe(df[["name", "income", "calculated_tax"]], use_container_width=True)
-
-            st.subheader("📊 인별 소득 및 세금 비교 그래프")
-            st.bar_chart(df.set_index("name")[["income", "calculated_tax"]])
-
-            output = BytesIO()
-            df.to_excel(output, index=False, engine='openpyxl')
-            st.download_button(
-                label="📥 계산된 결과 다운로드 (Excel)",
-                data=output.getvalue(),
-                file_name="tax_calculated.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            st.dataframe(result[["name", "income", "calculated_tax"]], use_container_width=True)
+
+            st.subheader("📊 소득 구간별 분포")
+            summary = INCOME_LEVEL_TABLE.summarize(
+                result["income"].to_numpy(dtype=float, na_value=np.nan),
+                result["calculated_tax"].to_numpy(dtype=float, na_value=np.nan),
             )
+            summary = pd.DataFrame(summary).set_index("bracket")
+            st.dataframe(summary, use_container_width=True)
+            st.bar_chart(summary[["income", "tax"]])
+
+            if len(result) <= MAX_PER_PERSON_CHART_ROWS:
+                st.subheader("📊 인별 소득 및 세금 비교 그래프")
+                st.bar_chart(result.set_index("name")[["income", "calculated_tax"]])
+            else:
+                st.caption(f"행이 {MAX_PER_PERSON_CHART_ROWS:,}개를 넘어 인별 그래프는 생략했습니다.")
+
+            # 엑셀 직렬화는 다운로드를 요청할 때만 수행
+            if st.button("📦 다운로드용 엑셀 파일 만들기"):
+                st.session_state.excel_request = (content_hash, all_sheets, tax_rate)
+            if st.session_state.get("excel_request") == (content_hash, all_sheets, tax_rate):
+                st.download_button(
+                    label="📥 계산된 결과 다운로드 (Excel)",
+                    data=to_excel_bytes(content_hash, all_sheets, tax_rate, result),
+                    file_name="tax_calculated.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
         else:
             st.error("❌ 'income' 열이 존재하지 않습니다. 엑셀 파일을 확인해주세요.")
     except Exception as e:
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# 누적 통계 (Welford / Chan 병합)
+# -------------------------------
+class RunningStats:
+    """평균과 분산을 데이터 전체를 보관하지 않고 묶음 단위로 갱신
+
+    중앙값은 크기가 정해진 표본 저장소(reservoir)로 근사한다.
+    """
+
+    def __init__(self, reservoir_size=10000, rng=None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.reservoir_size = reservoir_size
+        self.reservoir = np.empty(0)
+        self.rng = rng if rng is not None else np.random.default_rng(0)
+
+    def merge(self, count, mean, m2):
+        """다른 묶음의 (개수, 평균, 편차제곱합)을 합침"""
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        mean = values.mean()
+        seen = self.count
+        self.merge(len(values), mean, ((values - mean) ** 2).sum())
+        self._sample(values, seen)
+
+    def _sample(self, values, seen):
+        # Algorithm R: 저장소가 찰 때까지는 그대로 담고, 이후 i번째 값은 k/i 확률로 교체
+        room = self.reservoir_size - len(self.reservoir)
+        if room > 0:
+            self.reservoir = np.concatenate((self.reservoir, values[:room]))
+            values = values[room:]
+            seen += room
+        if len(values) == 0:
+            return
+        positions = seen + np.arange(len(values))
+        slots = self.rng.integers(0, positions + 1)
+        keep = slots < self.reservoir_size
+        self.reservoir[slots[keep]] = values[keep]
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def median(self):
+        return float(np.median(self.reservoir)) if len(self.reservoir) else np.nan
+
+    def value(self, strategy):
+        if self.count == 0:
+            return np.nan
+        return self.mean if strategy == "mean" else self.median
+
+
+# -------------------------------
+# 2단계 스트리밍 결측치 채우기
+# -------------------------------
+class StreamingImputer:
+    """1단계(fit)에서 열별 평균/중앙값을 누적하고, 2단계(transform)에서 빈 값을 채움
+
+    group_by를 주면 그룹별 값으로 채우고, 그룹 값이 없으면 전체 값으로 채운다.
+    메모리 사용량은 행 수가 아니라 chunksize와 그룹 수에만 비례한다.
+    """
+
+    def __init__(self, columns, strategy="mean", group_by=None, reservoir_size=10000, seed=0):
+        if strategy not in ("mean", "median"):
+            raise ValueError(f"지원하지 않는 방식입니다: {strategy}")
+        self.columns = list(columns)
+        self.strategy = strategy
+        self.group_by = group_by
+        self.reservoir_size = reservoir_size
+        self.rng = np.random.default_rng(seed)
+        self.overall = {c: self._new_stats() for c in self.columns}
+        self.groups = {c: {} for c in self.columns}
+
+    def _new_stats(self):
+        return RunningStats(self.reservoir_size, self.rng)
+
+    def partial_fit(self, chunk):
+        for col in self.columns:
+            values = pd.to_numeric(chunk[col], errors="coerce")
+            self.overall[col].update(values.to_numpy(dtype=np.float64))
+            if self.group_by is None:
+                continue
+            for key, group_values in values.groupby(chunk[self.group_by], sort=False):
+                stats = self.groups[col].get(key)
+                if stats is None:
+                    stats = self.groups[col][key] = self._new_stats()
+                stats.update(group_values.to_numpy(dtype=np.float64))
+        return self
+
+    def fill_values(self):
+        """열별 전체 채움 값"""
+        return {c: self.overall[c].value(self.strategy) for c in self.columns}
+
+    def group_fill_values(self, col):
+        """한 열의 그룹별 채움 값"""
+        return {k: s.value(self.strategy) for k, s in self.groups[col].items()}
+
+    def transform(self, chunk):
+        chunk = chunk.copy()
+        overall = self.fill_values()
+        for col in self.columns:
+            fill = overall[col]
+            if self.group_by is not None:
+                fill = chunk[self.group_by].map(self.group_fill_values(col)).fillna(fill)
+            chunk[col] = chunk[col].fillna(fill)
+        return chunk
+
+    def fit_csv(self, path, chunksize=100000):
+        """1단계: CSV를 묶음 단위로 읽으며 통계만 누적"""
+        usecols = self.columns + ([self.group_by] if self.group_by else [])
+        for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize):
+            self.partial_fit(chunk)
+        return self
+
+    def transform_csv(self, src, dst, chunksize=100000):
+        """2단계: CSV를 다시 묶음 단위로 읽어 채운 결과를 바로 씀, 처리한 행 수를 돌려줌"""
+        total = 0
+        for i, chunk in enumerate(pd.read_csv(src, chunksize=chunksize)):
+            self.transform(chunk).to_csv(dst, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+            total += len(chunk)
+        return total
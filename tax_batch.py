@@ -0,0 +1,120 @@
+# 사용법: python tax_batch.py 입력폴더 -o 결과폴더 [--rate 10 | --table payroll] [--year 2025] [--workers 4]
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tax_engine import BracketTable
+from tax_export import iter_dataframe_csv, write_chunks
+from tax_tables import DEFAULT_JURISDICTION, load_registry
+
+SUPPORTED = {".xlsx", ".xlsm", ".csv"}
+
+
+# -------------------------------
+# 파일 하나 처리 (작업 프로세스에서 실행)
+# -------------------------------
+def read_payroll(path):
+    if path.suffix.lower() == ".csv":
+        return pd.read_csv(path)
+    return pd.read_excel(path, engine="openpyxl")
+
+
+def apply_tax(df, table, progressive=False):
+    """income 열에 세율표를 적용해 calculated_tax 열을 추가 (빈 소득은 빈 세금)
+
+    숫자로 바꾼 소득 배열(숫자가 아닌 칸은 NaN)도 함께 돌려준다.
+    """
+    incomes = pd.to_numeric(df["income"], errors="coerce").to_numpy(dtype=np.float64)
+    valid = ~np.isnan(incomes)
+    taxes = np.full(len(df), np.nan)
+    calc = table.progressive_tax_won if progressive else table.flat_tax_won
+    taxes[valid] = calc(incomes[valid])
+    df["calculated_tax"] = taxes
+    return df, incomes
+
+
+def process_file(path, out_dir, table, progressive, compress=False):
+    """입력 파일 하나를 계산해 결과 CSV를 쓰고 요약 한 줄을 돌려줌"""
+    start = time.perf_counter()
+    try:
+        df = read_payroll(path)
+        if "income" not in df.columns:
+            raise ValueError("'income' 열이 없습니다")
+        df, incomes = apply_tax(df, table, progressive)
+        suffix = ".csv.gz" if compress else ".csv"
+        write_chunks(iter_dataframe_csv(df, encoding="utf-8-sig", compress=compress),
+                     out_dir / f"{path.stem}_tax{suffix}")
+        return {
+            "file": path.name,
+            "rows": len(df),
+            "income_sum": float(np.nansum(incomes)),
+            "tax_sum": df["calculated_tax"].sum(),
+            "seconds": round(time.perf_counter() - start, 3),
+            "error": "",
+        }
+    except Exception as e:
+        return {"file": path.name, "rows": 0, "income_sum": 0, "tax_sum": 0,
+                "seconds": round(time.perf_counter() - start, 3), "error": str(e)}
+
+
+# -------------------------------
+# 명령줄 진입점
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="폴더 안의 급여 파일(.xlsx/.csv)에 세금을 일괄 계산")
+    parser.add_argument("input_dir", type=Path)
+    parser.add_argument("-o", "--output-dir", type=Path, default=Path("tax_output"))
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--rate", type=float, help="단일 세율(%%), VBA 연습.py 와 같은 방식")
+    group.add_argument("--table", default="payroll", help="tax_tables.json 의 세율표 이름")
+    parser.add_argument("--jurisdiction", default=DEFAULT_JURISDICTION, help="세율표 관할 (예: KR)")
+    parser.add_argument("--year", type=int, help="세율표 연도 (생략하면 가장 최근)")
+    parser.add_argument("--progressive", action="store_true", help="구간 초과분에만 세율 적용(누진)")
+    parser.add_argument("--gzip", action="store_true", help="결과 파일을 .csv.gz로 압축")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    if args.rate is not None:
+        table = BracketTable([], [args.rate / 100])
+    else:
+        try:
+            table = load_registry().get(args.table, args.year, args.jurisdiction)
+        except KeyError:
+            parser.error(f"세율표를 찾을 수 없습니다: {args.jurisdiction}/{args.year or '최근'}/{args.table}")
+    files = sorted(p for p in args.input_dir.iterdir() if p.suffix.lower() in SUPPORTED)
+    if not files:
+        parser.error(f"{args.input_dir} 에 처리할 파일이 없습니다.")
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(
+            process_file,
+            files,
+            [args.output_dir] * len(files),
+            [table] * len(files),
+            [args.progressive] * len(files),
+            [args.gzip] * len(files),
+        ))
+    elapsed = time.perf_counter() - start
+
+    summary = pd.DataFrame(results)
+    total = {"file": "합계", "rows": summary["rows"].sum(), "income_sum": summary["income_sum"].sum(),
+             "tax_sum": summary["tax_sum"].sum(), "seconds": round(elapsed, 3), "error": ""}
+    summary = pd.concat([summary, pd.DataFrame([total])], ignore_index=True)
+    summary.to_csv(args.output_dir / "summary.csv", index=False, encoding="utf-8-sig")
+
+    failed = (summary["error"] != "").sum()
+    print(f"✅ {len(files)}개 파일, {total['rows']:,}행 처리 ({elapsed:.2f}초, 실패 {failed}개)")
+    print(f"📄 요약: {args.output_dir / 'summary.csv'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,164 @@
+# 사용법: python tax_bench.py [--sizes 1e3 1e5 1e7] [--output bench.json] [--baseline 이전결과.json]
+#
+# 각 세금 계산 경로의 처리량(행/초)과 최대 메모리를 재고 JSON으로 저장한다.
+# --baseline 을 주면 이전 결과보다 tolerance 이상 느려진 항목을 표시하고 종료 코드 1을 돌려준다.
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from tax_tables import get_table
+
+DEFAULT_SIZES = [1e3, 1e4, 1e5, 1e6, 1e7]
+SCALAR_MAX_ROWS = 100000  # 한 명씩 부르는 경로는 이 크기까지만
+
+
+# -------------------------------
+# 측정 대상
+# -------------------------------
+def make_incomes(n, seed=0):
+    return np.random.default_rng(seed).integers(0, 200000000, n).astype(np.float64)
+
+
+def scalar_loop(table):
+    # 화면용 calculate_tax처럼 한 명씩 계산
+    def run(incomes):
+        return [int(table.flat_tax_won(x)) for x in incomes.tolist()]
+    return run
+
+
+def make_dataframe(incomes):
+    return pd.DataFrame({"name": np.arange(len(incomes)).astype(str), "income": incomes})
+
+
+def to_int64(incomes):
+    # 이미 원 단위 정수로 읽어 둔 소득 (NaN 검사·반올림을 건너뛰는 경로)
+    return incomes.astype(np.int64)
+
+
+def vba_dataframe(tax_rate=10):
+    # VBA 연습.py: 읽어 둔 표에 세금 열을 붙이는 경로
+    def run(df):
+        return df.assign(calculated_tax=df["income"] * (tax_rate / 100))
+    return run
+
+
+def build_cases():
+    flat_10 = get_table("flat_10")
+    payroll = get_table("payroll")
+    income_level = get_table("income_level")
+    # 이름: (측정 함수, 최대 행 수, 입력 준비 함수)
+    return {
+        # 소득의 10% 세금 계산기.py, 함수 연습.py
+        "flat_10.calculate_tax (scalar)": (scalar_loop(flat_10), SCALAR_MAX_ROWS, None),
+        "flat_10.flat_tax_won": (flat_10.flat_tax_won, None, None),
+        "flat_10.flat_tax_won (int64)": (flat_10.flat_tax_won, None, to_int64),
+        # For문 연습.py
+        "payroll.calculate_tax (scalar)": (scalar_loop(payroll), SCALAR_MAX_ROWS, None),
+        "payroll.flat_tax_won": (payroll.flat_tax_won, None, None),
+        "payroll.progressive_tax_won": (payroll.progressive_tax_won, None, None),
+        "payroll.flat_tax_won (int64)": (payroll.flat_tax_won, None, to_int64),
+        # 소득세 계산기 연습.py
+        "income_level.flat_tax": (income_level.flat_tax, None, None),
+        "income_level.progressive_tax": (income_level.progressive_tax, None, None),
+        # VBA 연습.py
+        "vba.dataframe_assign": (vba_dataframe(), None, make_dataframe),
+    }
+
+
+# -------------------------------
+# 측정
+# -------------------------------
+def measure(func, data, repeat):
+    """가장 빠른 실행 시간(초)과 최대 추가 메모리(바이트)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run_benchmarks(sizes, repeat, only=None):
+    results = []
+    for name, (func, max_rows, prepare) in build_cases().items():
+        if only and only not in name:
+            continue
+        for n in sizes:
+            if max_rows is not None and n > max_rows:
+                continue
+            data = make_incomes(n)
+            if prepare is not None:
+                data = prepare(data)
+            seconds, peak = measure(func, data, repeat)
+            results.append({
+                "case": name,
+                "rows": n,
+                "seconds": seconds,
+                "rows_per_sec": n / seconds if seconds > 0 else float("inf"),
+                "peak_bytes": peak,
+            })
+            print(f"{name:34s} {n:>10,}행  {n / seconds:>14,.0f} 행/초  {peak / 1e6:>9,.1f} MB")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """baseline보다 처리량이 tolerance 비율 이상 떨어진 항목 목록"""
+    old = {(r["case"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        prev = old.get((r["case"], r["rows"]))
+        if prev and r["rows_per_sec"] < prev["rows_per_sec"] * (1 - tolerance):
+            regressions.append((r, prev))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="세금 계산 경로 벤치마크")
+    parser.add_argument("--sizes", type=float, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="이름에 이 문자열이 들어간 항목만 측정")
+    parser.add_argument("--output", default=f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 처리량 감소 비율")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes]
+    results = run_benchmarks(sizes, args.repeat, args.only)
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📄 결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for r, prev in regressions:
+            print(f"⚠️ 느려짐: {r['case']} {r['rows']:,}행 "
+                  f"{prev['rows_per_sec']:,.0f} → {r['rows_per_sec']:,.0f} 행/초")
+        if regressions:
+            return 1
+        print("✅ 기준 대비 느려진 항목 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,315 @@
+import bisect
+import math
+
+import numpy as np
+
+# -------------------------------
+# 정수(원) 고정소수점 계산
+# -------------------------------
+# 세율은 1/10000 단위(bp) 정수로 표현: 10% -> 1000, 0.5% -> 50
+RATE_SCALE = 10000
+# 세율(bp)을 곱해도 int64를 넘지 않는 금액의 한계 (이 이상·무한대는 계산하지 않음)
+MAX_WON = 2 ** 63 // RATE_SCALE
+MAX_WON_FLOAT = float(MAX_WON)  # 2**53 미만이라 정확히 표현됨 (단일 값 비교용)
+
+
+def _check_won_range(lo, hi):
+    if not (-MAX_WON < lo and hi < MAX_WON):
+        if lo != lo or hi != hi:
+            raise ValueError("금액에 빈 값(NaN)이 있습니다.")
+        raise ValueError(f"금액은 절댓값이 {MAX_WON:,}원 미만이어야 합니다.")
+
+
+def to_won(amounts):
+    """금액을 int64 원 단위로 변환 (원 미만은 반올림, 빈 값과 범위 밖 금액은 허용하지 않음)"""
+    amounts = np.asarray(amounts)
+    if amounts.size:
+        # 최솟값·최댓값만 보면 NaN(전파됨), 무한대, 범위 밖 값을 임시 배열 없이 한 번에 걸러냄
+        _check_won_range(amounts.min(), amounts.max())
+    if amounts.dtype.kind in "iu":
+        # 이미 정수면 반올림 없이 (int64면 복사도 없이) 그대로 사용
+        return amounts.astype(np.int64, copy=False)
+    # 반올림 결과를 바로 int64 배열에 써서 임시 float 배열을 만들지 않음
+    return np.rint(amounts, out=np.empty(amounts.shape, dtype=np.int64), casting="unsafe")
+
+
+def to_won_scalar(amount):
+    """to_won의 단일 값 버전 (파이썬 int, 반올림 방식도 동일하게 짝수 반올림)"""
+    if not -MAX_WON_FLOAT < amount < MAX_WON_FLOAT:
+        _check_won_range(amount, amount)
+    if isinstance(amount, float):
+        return round(amount)  # float의 round()는 바로 파이썬 int
+    if isinstance(amount, (int, np.integer)):
+        return int(amount)
+    return int(round(amount))
+
+
+def to_rate_bp(rates):
+    """소수 세율(0.06)을 bp 정수(600)로 변환"""
+    return np.rint(np.asarray(rates, dtype=np.float64) * RATE_SCALE).astype(np.int64)
+
+
+def round_won(scaled, rounding="floor", unit=1, inplace=False):
+    """RATE_SCALE 배 된 정수 세액을 원 단위로 맞춤
+
+    rounding: "floor"(절사, 기본), "half_up"(반올림), "ceil"(절상)
+    unit: 1이면 원 미만, 10이면 10원 미만을 같은 방식으로 처리
+    inplace: 임시 int64 배열이면 그 자리에서 계산해 새 배열을 만들지 않음
+    """
+    scale = RATE_SCALE * unit
+    if inplace:
+        return _round_won_inplace(scaled, rounding, unit, scale)
+    if rounding == "floor":
+        won = scaled // scale
+    elif rounding == "half_up":
+        won = (scaled + scale // 2) // scale
+    elif rounding == "ceil":
+        won = -((-scaled) // scale)
+    else:
+        raise ValueError(f"지원하지 않는 반올림 방식입니다: {rounding}")
+    return won * unit if unit != 1 else won
+
+
+def _round_won_inplace(scaled, rounding, unit, scale):
+    if rounding == "floor":
+        np.floor_divide(scaled, scale, out=scaled)
+    elif rounding == "half_up":
+        scaled += scale // 2
+        np.floor_divide(scaled, scale, out=scaled)
+    elif rounding == "ceil":
+        np.negative(scaled, out=scaled)
+        np.floor_divide(scaled, scale, out=scaled)
+        np.negative(scaled, out=scaled)
+    else:
+        raise ValueError(f"지원하지 않는 반올림 방식입니다: {rounding}")
+    if unit != 1:
+        scaled *= unit
+    return scaled
+
+
+def fixed_point_tax(incomes, rates_bp, rounding="floor", unit=1):
+    """int64 원 소득 x bp 세율을 정수로만 계산한 세금"""
+    return round_won(to_won(incomes) * np.asarray(rates_bp, dtype=np.int64), rounding, unit, inplace=True)
+
+
+CAST_BLOCK = 1 << 14
+
+
+def _single_rate_float_tax(incomes, rate_bp, rounding, unit):
+    """단일 세율 float 소득을 float64 그대로 정확히 계산하는 빠른 경로 (범위를 넘으면 None)
+
+    반올림한 소득은 정수 값이고, 세율/배율을 약분한 분자를 곱해도 2**52 미만이면
+    float64로 정확히 표현된다. 그 범위에서는 정수 몫의 floor/ceil도 정수 계산과 같다.
+    """
+    scale = RATE_SCALE * unit
+    g = math.gcd(rate_bp, scale)
+    num, den = rate_bp // g, scale // g
+    limit = (2 ** 52 - den) / max(num, 1) - 1
+    if not (-limit < incomes.min() and incomes.max() < limit):
+        return None  # NaN·범위 밖 값은 정수 경로가 검사하고 처리
+    # 결과 int64 배열의 메모리를 float64 작업 공간으로 같이 써서 큰 배열을 하나만 만듦
+    tax = np.empty(incomes.shape, dtype=np.int64)
+    won = tax.view(np.float64)
+    np.rint(incomes, out=won)
+    if num != 1:
+        won *= num
+    if rounding == "half_up":
+        won += den / 2
+    elif rounding not in ("floor", "ceil"):
+        raise ValueError(f"지원하지 않는 반올림 방식입니다: {rounding}")
+    if den != 1:
+        won /= den
+    op = np.ceil if rounding == "ceil" else np.floor
+    op(won, out=won)
+    # 같은 메모리를 int64로 바꿀 때 numpy가 통째로 임시 복사하지 않도록 블록 단위로 변환
+    flat_tax, flat_won = tax.reshape(-1), won.reshape(-1)
+    for i in range(0, flat_won.size, CAST_BLOCK):
+        flat_tax[i:i + CAST_BLOCK] = flat_won[i:i + CAST_BLOCK]
+    if unit != 1:
+        tax *= unit
+    return tax
+
+
+SCALAR_TYPES = (int, float, np.integer, np.floating)
+COMPARE_MAX_THRESHOLDS = 16  # 이보다 구간이 많으면 searchsorted 사용
+
+
+# -------------------------------
+# 세율 구간표
+# -------------------------------
+class BracketTable:
+    """구간 상한(thresholds)과 구간별 세율(rates)로 만든 세율표
+
+    thresholds[i] 이하의 소득은 i번째 구간에 속하고,
+    rates는 thresholds보다 하나 더 길어 마지막 값이 최고 구간 세율이 된다.
+    """
+
+    def __init__(self, thresholds, rates, labels=None):
+        self.thresholds = np.asarray(thresholds, dtype=np.float64)
+        self.rates = np.asarray(rates, dtype=np.float64)
+        if len(self.rates) != len(self.thresholds) + 1:
+            raise ValueError("세율 개수는 구간 상한 개수보다 1개 많아야 합니다.")
+        if np.any(np.diff(self.thresholds) <= 0):
+            raise ValueError("구간 상한은 오름차순이어야 합니다.")
+        self.labels = list(labels) if labels is not None else None
+
+        # 각 구간의 하한과, 그 하한까지 누진 계산으로 쌓인 세액을 미리 계산
+        self.lower = np.concatenate(([0.0], self.thresholds))
+        widths = np.diff(self.lower)
+        self.base = np.concatenate(([0.0], np.cumsum(widths * self.rates[:-1])))
+
+        # 정수 계산용: 원 단위 하한, bp 세율, RATE_SCALE 배 된 누적 세액
+        self.rates_bp = to_rate_bp(self.rates)
+        self.lower_won = to_won(self.lower)
+        widths_won = np.diff(self.lower_won)
+        self.base_scaled = np.concatenate(([0], np.cumsum(widths_won * self.rates_bp[:-1])))
+
+        # 정수 소득 w에 대해 w <= 상한 ⇔ w <= floor(상한) 이므로, 원 단위 소득은 정수 상한으로 바로 비교
+        self.thresholds_floor = np.floor(self.thresholds).astype(np.int64)
+        self.single_rate = len(self.thresholds) == 0
+        self._thresholds_floor_list = self.thresholds_floor.tolist()
+
+        # 한 명씩 계산하는 경로(calculate_tax)용 파이썬 값
+        self._thresholds_list = self.thresholds.tolist()
+        self._rates_bp_list = self.rates_bp.tolist()
+        self._lower_won_list = self.lower_won.tolist()
+        self._base_scaled_list = self.base_scaled.tolist()
+
+    def _bracket_index_won(self, won):
+        """to_won으로 바꾼 int64 소득의 구간 번호 (float 상한과 비교하는 형 변환을 피함)
+
+        구간이 몇 개 안 되면 상한마다 한 번씩 비교해 더하는 편이 이진 탐색보다 빠르다.
+        """
+        if len(self.thresholds_floor) > COMPARE_MAX_THRESHOLDS:
+            return np.searchsorted(self.thresholds_floor, won, side="left")
+        idx = np.zeros(won.shape, dtype=np.uint8)
+        for t in self._thresholds_floor_list:
+            idx += won > t
+        return idx
+
+    def bracket_index(self, incomes):
+        """소득이 속한 구간 번호 (소득 <= 상한 이면 해당 구간)"""
+        return np.searchsorted(self.thresholds, incomes, side="left")
+
+    def flat_tax(self, incomes):
+        """소득 전체에 해당 구간 세율을 곱한 세금 (기존 if/elif 계산과 동일)"""
+        incomes = np.asarray(incomes, dtype=np.float64)
+        return incomes * self.rates[self.bracket_index(incomes)]
+
+    def progressive_tax(self, incomes):
+        """구간별로 초과분에만 해당 세율을 적용한 누진 세금"""
+        incomes = np.asarray(incomes, dtype=np.float64)
+        idx = self.bracket_index(incomes)
+        return self.base[idx] + (incomes - self.lower[idx]) * self.rates[idx]
+
+    def flat_tax_won(self, incomes, rounding="floor", unit=1):
+        """flat_tax의 정수(원) 버전 (단일 값을 넣으면 파이썬 int를 돌려줌)"""
+        if type(incomes) is float and -MAX_WON_FLOAT < incomes < MAX_WON_FLOAT:
+            # calculate_tax처럼 float 하나씩 넣는 가장 흔한 경우는 to_won_scalar 호출도 생략
+            won = round(incomes)
+        elif isinstance(incomes, SCALAR_TYPES):
+            won = to_won_scalar(incomes)
+        elif self.single_rate:
+            return self._single_rate_tax(incomes, rounding, unit)
+        else:
+            incomes = to_won(incomes)
+            return fixed_point_tax(incomes, self.rates_bp[self._bracket_index_won(incomes)], rounding, unit)
+        if self.single_rate:
+            rate_bp = self._rates_bp_list[0]
+        else:
+            rate_bp = self._rates_bp_list[bisect.bisect_left(self._thresholds_list, won)]
+        if rounding == "floor" and unit == 1:
+            return won * rate_bp // RATE_SCALE
+        return round_won(won * rate_bp, rounding, unit)
+
+    def progressive_tax_won(self, incomes, rounding="floor", unit=1):
+        """progressive_tax의 정수(원) 버전 (반올림은 마지막에 한 번만)"""
+        if isinstance(incomes, SCALAR_TYPES):
+            won = to_won_scalar(incomes)
+            i = bisect.bisect_left(self._thresholds_list, won)
+            scaled = self._base_scaled_list[i] + (won - self._lower_won_list[i]) * self._rates_bp_list[i]
+            return round_won(scaled, rounding, unit)
+        if self.single_rate:
+            return self._single_rate_tax(incomes, rounding, unit)
+        incomes = to_won(incomes)
+        idx = self._bracket_index_won(incomes)
+        scaled = incomes - self.lower_won[idx]
+        scaled *= self.rates_bp[idx]
+        scaled += self.base_scaled[idx]
+        return round_won(scaled, rounding, unit, inplace=True)
+
+    def _single_rate_tax(self, incomes, rounding, unit):
+        """단일 세율표의 배열 계산 (flat과 progressive가 같음)"""
+        incomes = np.asarray(incomes)
+        if incomes.dtype.kind == "f" and incomes.size:
+            tax = _single_rate_float_tax(incomes, self._rates_bp_list[0], rounding, unit)
+            if tax is not None:
+                return tax
+        return round_won(to_won(incomes) * self._rates_bp_list[0], rounding, unit, inplace=True)
+
+    def label(self, income):
+        """단일 소득의 구간 이름"""
+        if self.labels is None:
+            return None
+        return self.labels[int(self.bracket_index(income))]
+
+    def bracket_names(self):
+        """구간 이름 목록 (labels가 없으면 '~5,000만' 같은 범위 표기)"""
+        if self.labels is not None:
+            return list(self.labels)
+        bounds = [f"{t / 10000:,.0f}만" for t in self.thresholds]
+        if not bounds:
+            return ["전체"]
+        return [f"~{bounds[0]}"] + [f"{a}~{b}" for a, b in zip(bounds, bounds[1:])] + [f"{bounds[-1]}~"]
+
+    def summarize(self, incomes, taxes):
+        """구간별 인원, 소득 합계, 세금 합계를 한 번에 집계 (빈 소득은 제외)
+
+        행 수와 상관없이 구간 개수만큼의 작은 결과만 돌려준다.
+        """
+        incomes = np.asarray(incomes, dtype=np.float64)
+        taxes = np.asarray(taxes, dtype=np.float64)
+        valid = ~np.isnan(incomes)
+        incomes, taxes = incomes[valid], np.nan_to_num(taxes[valid])
+        # right=True: 상한과 같은 소득은 아래 구간 (bracket_index와 동일)
+        idx = np.digitize(incomes, self.thresholds, right=True)
+        n = len(self.rates)
+        return {
+            "bracket": self.bracket_names(),
+            "count": np.bincount(idx, minlength=n),
+            "income": np.bincount(idx, weights=incomes, minlength=n),
+            "tax": np.bincount(idx, weights=taxes, minlength=n),
+        }
+
+
+# -------------------------------
+# 세율 시나리오(what-if) 행렬
+# -------------------------------
+class RateSweep:
+    """모든 납세자 x 후보 세율(%) 세금을 한 번의 브로드캐스트로 미리 계산
+
+    taxes[j]는 rates[j] 세율을 적용한 전체 납세자 세금이라서
+    세율별 조회가 연속된 메모리 한 줄을 읽는 것으로 끝난다.
+    """
+
+    def __init__(self, incomes, rates):
+        self.rates = np.asarray(rates, dtype=np.float64)
+        if np.any(np.diff(self.rates) <= 0):
+            raise ValueError("후보 세율은 오름차순이어야 합니다.")
+        incomes = np.asarray(incomes, dtype=np.float64)
+        self.taxes = (self.rates / 100)[:, None] * incomes[None, :]
+        self.revenue = np.nansum(self.taxes, axis=1)
+
+    def rate_index(self, rate):
+        idx = int(np.searchsorted(self.rates, rate))
+        if idx >= len(self.rates) or self.rates[idx] != rate:
+            raise KeyError(rate)
+        return idx
+
+    def tax_at(self, rate):
+        """해당 세율의 납세자별 세금"""
+        return self.taxes[self.rate_index(rate)]
+
+    def revenue_at(self, rate):
+        """해당 세율의 총 세수"""
+        return self.revenue[self.rate_index(rate)]
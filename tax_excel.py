@@ -0,0 +1,199 @@
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+# 시트마다 다른 열 이름을 name / income 으로 맞추기 위한 별칭
+COLUMN_ALIASES = {
+    "name": ["name", "이름", "성명", "납세자", "taxpayer"],
+    "income": ["income", "소득", "연소득", "소득금액", "salary"],
+}
+
+# -------------------------------
+# 엑셀 스트리밍 읽기 / 쓰기
+# -------------------------------
+def iter_excel_chunks(source, chunk_size=10000):
+    """첫 번째 시트를 읽기 전용 커서로 열어 헤더와 행 묶음을 차례로 돌려줌
+
+    첫 값은 헤더 리스트이고, 이후 값은 최대 chunk_size개의 행 리스트이다.
+    """
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        yield list(next(rows, ()))
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        wb.close()
+
+
+def chunk_tax(chunk, income_idx, tax_rate):
+    """행 묶음의 income 열에 세율(%)을 곱한 세금 배열 (빈 값은 NaN)"""
+    incomes = np.array(
+        [row[income_idx] if income_idx < len(row) else None for row in chunk],
+        dtype=np.float64,
+    )
+    return incomes * (tax_rate / 100)
+
+
+def stream_tax_workbook(source, destination, tax_rate, chunk_size=10000):
+    """업로드 파일을 묶음 단위로 읽어 calculated_tax 열을 붙인 엑셀을 바로 써 내려감
+
+    한 번에 메모리에 올라가는 행은 chunk_size개를 넘지 않는다.
+    처리한 행 수를 돌려주며, income 열이 없으면 KeyError를 낸다.
+    """
+    chunks = iter_excel_chunks(source, chunk_size)
+    header = next(chunks)
+    if "income" not in header:
+        chunks.close()
+        raise KeyError("income")
+    income_idx = header.index("income")
+
+    out = Workbook(write_only=True)
+    ws = out.create_sheet()
+    ws.append(header + ["calculated_tax"])
+
+    total = 0
+    for chunk in chunks:
+        taxes = chunk_tax(chunk, income_idx, tax_rate)
+        for row, tax in zip(chunk, taxes):
+            ws.append(list(row) + [None if np.isnan(tax) else float(tax)])
+        total += len(chunk)
+
+    out.save(destination)
+    return total
+
+
+# -------------------------------
+# 업로드 표 메모리 줄이기
+# -------------------------------
+def compact_dtypes(df, money_columns=("income",), category_columns=("name",)):
+    """열 자료형을 작은 형태로 바꾸고 (표, 변경 전 바이트, 변경 후 바이트)를 돌려줌
+
+    - category_columns: 문자열 열을 category로 (같은 이름은 한 번만 저장)
+    - money_columns: 모두 원 단위 정수면 int64로 (빈 값이 있으면 nullable Int64), 원 미만이 있으면 그대로
+    - 나머지 숫자 열: 값 범위에 맞는 가장 작은 정수형으로
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    df = df.copy(deep=False)
+    for col in df.columns:
+        series = df[col]
+        if col in category_columns and pd.api.types.is_string_dtype(series):
+            df[col] = series.astype("category")
+        elif col in money_columns and pd.api.types.is_numeric_dtype(series):
+            # 원 미만 값이 있으면 그대로 둠 (세금 계산 전에 소득이 바뀌지 않도록)
+            values = series.dropna()
+            if (values == values.round()).all():
+                df[col] = series.astype("Int64") if len(values) < len(series) else series.astype(np.int64)
+        elif pd.api.types.is_float_dtype(series):
+            values = series.dropna()
+            if len(values) == len(series) and (values == values.round()).all():
+                df[col] = pd.to_numeric(series.astype(np.int64), downcast="integer")
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+    after = int(df.memory_usage(deep=True).sum())
+    return df, before, after
+
+
+# -------------------------------
+# 여러 시트 병렬 읽기
+# -------------------------------
+def normalize_columns(df):
+    """별칭(COLUMN_ALIASES)으로 열 이름을 맞추고 name/income 열만 남김 (없으면 None)"""
+    lookup = {alias.lower(): target for target, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    renamed = {}
+    for col in df.columns:
+        target = lookup.get(str(col).strip().lower())
+        if target is not None and target not in renamed.values():
+            renamed[col] = target
+    if "income" not in renamed.values():
+        return None
+    df = df.rename(columns=renamed)
+    if "name" not in df.columns:
+        df["name"] = None
+    return df[["name", "income"]]
+
+
+def read_sheet(source, sheet_name):
+    """시트 하나를 읽어 (이름 배열, 소득 배열)로 돌려줌 (작업 프로세스에서 실행)"""
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    df = normalize_columns(pd.read_excel(source, sheet_name=sheet_name, engine="openpyxl"))
+    if df is None:
+        return None
+    names = df["name"].to_numpy(dtype=object)
+    incomes = pd.to_numeric(df["income"], errors="coerce").to_numpy(dtype=np.float64)
+    return names, incomes
+
+
+@lru_cache(maxsize=2)
+def sheet_pool(workers):
+    """시트 읽기용 작업 프로세스 풀 (프로세스마다 하나를 만들어 계속 재사용)
+
+    Streamlit 서버처럼 스레드가 도는 프로세스에서 fork하지 않도록 spawn으로 띄운다.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def read_all_sheets(source, max_workers=None):
+    """모든 시트를 작업 프로세스에서 동시에 읽어 name / income / sheet 표 하나로 합침
+
+    source는 파일 경로 또는 엑셀 파일 내용(bytes).
+    bytes는 임시 파일에 한 번만 써서 작업 프로세스에는 경로만 넘긴다.
+    income 열을 찾을 수 없는 시트는 건너뛰고, 건너뛴 시트 이름 목록을 함께 돌려준다.
+    """
+    tmp_path = None
+    if isinstance(source, bytes):
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
+            tmp.write(source)
+        source = tmp_path = tmp.name
+    try:
+        wb = load_workbook(source, read_only=True)
+        sheet_names = wb.sheetnames
+        wb.close()
+
+        if len(sheet_names) == 1:
+            parts = [read_sheet(source, sheet_names[0])]
+        else:
+            pool = sheet_pool(max_workers or os.cpu_count() or 1)
+            try:
+                parts = list(pool.map(read_sheet, [source] * len(sheet_names), sheet_names))
+            except BrokenProcessPool:
+                sheet_pool.cache_clear()  # 다음 호출에서 새 풀을 만듦
+                raise
+    finally:
+        if tmp_path is not None:
+            os.unlink(tmp_path)
+
+    loaded = [(name, part) for name, part in zip(sheet_names, parts) if part is not None]
+    skipped = [name for name, part in zip(sheet_names, parts) if part is None]
+
+    # 전체 길이만큼 한 번만 할당해 각 시트 결과를 채움 (concat 중간 복사 없음)
+    total = sum(len(part[1]) for _, part in loaded)
+    names = np.empty(total, dtype=object)
+    incomes = np.empty(total, dtype=np.float64)
+    sheet_codes = np.empty(total, dtype=np.int32)
+    pos = 0
+    for code, (_, (part_names, part_incomes)) in enumerate(loaded):
+        end = pos + len(part_incomes)
+        names[pos:end] = part_names
+        incomes[pos:end] = part_incomes
+        sheet_codes[pos:end] = code
+        pos = end
+
+    sheets = pd.Categorical.from_codes(sheet_codes, categories=[name for name, _ in loaded])
+    df = pd.DataFrame({"name": names, "income": incomes, "sheet": sheets}, copy=False)
+    return df, skipped
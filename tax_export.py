@@ -0,0 +1,77 @@
+import codecs
+import csv
+import io
+import zlib
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DATAFRAME_SLICE_ROWS = 10000
+
+
+# -------------------------------
+# 스트리밍 CSV 내보내기
+# -------------------------------
+def iter_encoded_chunks(pieces, chunk_size=DEFAULT_CHUNK_SIZE, encoding="utf-8", compress=False):
+    """문자열 조각들을 인코딩(및 gzip 압축)해 chunk_size 바이트씩 돌려주는 생성기
+
+    마지막 조각만 chunk_size보다 작을 수 있다.
+    """
+    encoder = codecs.getincrementalencoder(encoding)()  # utf-8-sig BOM은 처음 한 번만
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    out = bytearray()
+    for piece in pieces:
+        data = encoder.encode(piece)
+        out += compressor.compress(data) if compressor is not None else data
+        while len(out) >= chunk_size:
+            yield bytes(out[:chunk_size])
+            del out[:chunk_size]
+
+    data = encoder.encode("", True)
+    if compressor is not None:
+        data = compressor.compress(data) + compressor.flush()
+    out += data
+    while out:
+        yield bytes(out[:chunk_size])
+        del out[:chunk_size]
+
+
+def _csv_text_pieces(rows, header, piece_size):
+    # 작은 텍스트 버퍼를 piece_size만큼 채울 때마다 비우며 돌려줌
+    text = io.StringIO()
+    writer = csv.writer(text)
+    if header is not None:
+        writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if text.tell() >= piece_size:
+            yield text.getvalue()
+            text.seek(0)
+            text.truncate()
+    yield text.getvalue()
+
+
+def iter_csv_chunks(rows, header=None, chunk_size=DEFAULT_CHUNK_SIZE, encoding="utf-8", compress=False):
+    """행을 CSV로 바꿔 chunk_size 바이트씩 돌려줌 (전체 CSV 문자열을 만들지 않음)
+
+    compress=True 이면 gzip 형식(.csv.gz)으로 압축하며 흘려보낸다.
+    """
+    pieces = _csv_text_pieces(rows, header, chunk_size)
+    return iter_encoded_chunks(pieces, chunk_size, encoding, compress)
+
+
+def iter_dataframe_csv(df, chunk_size=DEFAULT_CHUNK_SIZE, encoding="utf-8", compress=False):
+    """DataFrame을 DATAFRAME_SLICE_ROWS행씩 to_csv로 바꿔 같은 방식으로 내보냄"""
+    pieces = (
+        df.iloc[i:i + DATAFRAME_SLICE_ROWS].to_csv(index=False, header=(i == 0), lineterminator="\r\n")
+        for i in range(0, max(len(df), 1), DATAFRAME_SLICE_ROWS)
+    )
+    return iter_encoded_chunks(pieces, chunk_size, encoding, compress)
+
+
+def write_chunks(chunks, path):
+    """바이트 조각을 차례로 파일에 기록, 쓴 바이트 수를 돌려줌"""
+    total = 0
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            total += len(chunk)
+    return total
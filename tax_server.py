@@ -0,0 +1,250 @@
+# 사용법: python tax_server.py [--host 127.0.0.1] [--port 8765]
+#
+#   GET  /health
+#   GET  /tax?income=55000000[&table=payroll][&year=2025][&jurisdiction=practice][&progressive=1]
+#   POST /tax/batch   {"incomes": [...], "table": ...}             -> {"taxes": [...]}
+#   POST /tax/batch   (Content-Type: application/x-ndjson)         -> 한 줄씩 결과를 스트리밍
+#                     줄마다 소득 숫자 또는 {"income": ...} 객체
+
+import argparse
+import asyncio
+import json
+import traceback
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from tax_tables import DEFAULT_JURISDICTION, load_registry
+
+NDJSON_BLOCK_LINES = 65536
+READ_SIZE = 1 << 20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# -------------------------------
+# 세금 계산
+# -------------------------------
+def resolve_table(params):
+    try:
+        year = params.get("year")
+        return load_registry().get(
+            params.get("table", "payroll"),
+            int(year) if year else None,
+            params.get("jurisdiction", DEFAULT_JURISDICTION),
+        )
+    except (KeyError, ValueError):
+        raise HTTPError(404, "세율표를 찾을 수 없습니다.")
+
+
+def compute(table, incomes, progressive):
+    """벡터화된 정수(원) 계산 경로로 세금 배열을 계산 (incomes는 1차원 숫자 목록)"""
+    try:
+        incomes = np.asarray(incomes, dtype=np.float64)
+    except (ValueError, TypeError):
+        raise HTTPError(400, "소득은 숫자여야 합니다.")
+    if incomes.ndim != 1:
+        raise HTTPError(400, "소득은 숫자 목록이어야 합니다.")
+    if not np.isfinite(incomes).all():
+        raise HTTPError(400, "소득에 빈 값이나 무한대가 있습니다.")
+    return table.progressive_tax_won(incomes) if progressive else table.flat_tax_won(incomes)
+
+
+def error_status(exc):
+    """예외를 (상태 코드, 메시지)로 바꿈: 입력 문제는 400, 그 밖의 오류는 500"""
+    if isinstance(exc, HTTPError):
+        return exc.status, str(exc)
+    if isinstance(exc, (ValueError, TypeError)):
+        return 400, "요청 값을 처리할 수 없습니다."
+    traceback.print_exc()
+    return 500, "서버 내부 오류가 발생했습니다."
+
+
+def is_true(value):
+    return str(value).lower() in ("1", "true", "yes")
+
+
+# -------------------------------
+# HTTP 처리
+# -------------------------------
+async def read_request_head(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "잘못된 요청 줄입니다.")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+def write_response(writer, status, body, content_type="application/json"):
+    if not isinstance(body, bytes):
+        body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+
+
+async def iter_body_lines(reader, length):
+    """요청 본문을 한 번에 올리지 않고 줄 묶음(최대 NDJSON_BLOCK_LINES)으로 돌려줌"""
+    remaining = length
+    pending = b""
+    while remaining > 0:
+        data = await reader.read(min(READ_SIZE, remaining))
+        if not data:
+            break
+        remaining -= len(data)
+        lines = (pending + data).split(b"\n")
+        pending = lines.pop()
+        for i in range(0, len(lines), NDJSON_BLOCK_LINES):
+            yield lines[i:i + NDJSON_BLOCK_LINES]
+    if pending:
+        yield [pending]
+
+
+def parse_ndjson_block(lines):
+    """숫자만 있는 줄은 한 번에 배열로 변환하고, 객체 줄은 json으로 읽음"""
+    lines = [line for line in lines if line.strip()]
+    try:
+        return np.array(lines, dtype=np.float64), None
+    except ValueError:
+        try:
+            records = [json.loads(line) for line in lines]
+            incomes = [r["income"] if isinstance(r, dict) else r for r in records]
+            return np.array(incomes, dtype=np.float64), records
+        except (ValueError, KeyError, TypeError):
+            raise HTTPError(400, "NDJSON 줄을 읽을 수 없습니다.")
+
+
+async def stream_ndjson(reader, writer, length, table, progressive):
+    writer.write(
+        b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson; charset=utf-8\r\n"
+        b"Transfer-Encoding: chunked\r\n\r\n"
+    )
+    async for lines in iter_body_lines(reader, length):
+        try:
+            incomes, records = parse_ndjson_block(lines)
+            taxes = compute(table, incomes, progressive).tolist()
+        except Exception as e:
+            # 헤더를 이미 보냈으므로 오류는 마지막 줄로 알리고 연결을 닫음
+            status, message = error_status(e)
+            chunk = (json.dumps({"error": message, "status": status}, ensure_ascii=False) + "\n").encode("utf-8")
+            writer.write(f"{len(chunk):x}\r\n".encode("latin-1") + chunk + b"\r\n0\r\n\r\n")
+            raise ConnectionError(message)
+        if not taxes:
+            continue
+        if records is None:
+            out = [str(t) for t in taxes]
+        else:
+            out = [json.dumps({**r, "tax": t} if isinstance(r, dict) else {"income": r, "tax": t},
+                              ensure_ascii=False) for r, t in zip(records, taxes)]
+        chunk = ("\n".join(out) + "\n").encode("utf-8")
+        writer.write(f"{len(chunk):x}\r\n".encode("latin-1") + chunk + b"\r\n")
+        await writer.drain()
+    writer.write(b"0\r\n\r\n")
+
+
+async def handle_request(reader, writer, method, target, headers):
+    url = urlsplit(target)
+    params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Content-Length 값이 잘못되었습니다.")
+    if length < 0:
+        raise HTTPError(400, "Content-Length 값이 잘못되었습니다.")
+
+    if url.path == "/health":
+        write_response(writer, 200, {"status": "ok"})
+    elif url.path == "/tax":
+        if method != "GET":
+            raise HTTPError(405, "GET만 지원합니다.")
+        try:
+            income = float(params["income"])
+        except (KeyError, ValueError):
+            raise HTTPError(400, "income 값이 필요합니다.")
+        table = resolve_table(params)
+        tax = int(compute(table, [income], is_true(params.get("progressive")))[0])
+        write_response(writer, 200, {"income": income, "tax": tax})
+    elif url.path == "/tax/batch":
+        if method != "POST":
+            raise HTTPError(405, "POST만 지원합니다.")
+        if "ndjson" in headers.get("content-type", ""):
+            table = resolve_table(params)
+            await stream_ndjson(reader, writer, length, table, is_true(params.get("progressive")))
+            return
+        try:
+            payload = json.loads(await reader.readexactly(length))
+            params.update({k: v for k, v in payload.items() if k != "incomes"})
+            incomes = payload["incomes"]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise HTTPError(400, '{"incomes": [...]} 형식이어야 합니다.')
+        table = resolve_table(params)
+        taxes = compute(table, incomes, is_true(params.get("progressive")))
+        write_response(writer, 200, {"taxes": taxes.tolist()})
+    else:
+        raise HTTPError(404, "없는 주소입니다.")
+
+
+async def handle_connection(reader, writer):
+    """한 연결에서 여러 요청을 차례로 처리 (keep-alive)"""
+    try:
+        while True:
+            try:
+                head = await read_request_head(reader)
+                if head is None:
+                    break
+                method, target, headers = head
+                await handle_request(reader, writer, method, target, headers)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                raise
+            except Exception as e:
+                status, message = error_status(e)
+                write_response(writer, status, {"error": message})
+                await writer.drain()
+                break
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port):
+    load_registry()  # 첫 요청 전에 세율표를 미리 읽어 둠
+    server = await asyncio.start_server(handle_connection, host, port)
+    print(f"🚀 세금 계산 서비스: http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 세금 계산 HTTP 서비스")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from tax_engine import BracketTable
+
+DATA_FILE = Path(__file__).with_name("tax_tables.json")
+DEFAULT_JURISDICTION = "practice"
+
+
+# -------------------------------
+# 세율표 레지스트리
+# -------------------------------
+class TaxTableRegistry:
+    """(관할, 연도, 이름)별 세율표 모음
+
+    데이터 파일의 각 표는 읽을 때 한 번만 BracketTable로 만들어 두므로
+    이후 조회는 정렬된 구간 배열을 그대로 재사용한다.
+    """
+
+    def __init__(self, data):
+        self._tables = {}
+        self.descriptions = {}
+        for jurisdiction, years in data.items():
+            for year, tables in years.items():
+                for name, spec in tables.items():
+                    key = (jurisdiction, int(year), name)
+                    self._tables[key] = BracketTable(spec["thresholds"], spec["rates"], spec.get("labels"))
+                    self.descriptions[key] = spec.get("description", "")
+
+    def get(self, name, year=None, jurisdiction=DEFAULT_JURISDICTION):
+        """세율표 조회 (year를 생략하면 해당 이름의 가장 최근 연도)"""
+        if year is None:
+            years = self.years(jurisdiction, name)
+            if not years:
+                raise KeyError((jurisdiction, name))
+            year = years[-1]
+        return self._tables[(jurisdiction, int(year), name)]
+
+    def years(self, jurisdiction=DEFAULT_JURISDICTION, name=None):
+        return sorted({y for j, y, n in self._tables if j == jurisdiction and (name is None or n == name)})
+
+    def names(self, jurisdiction=DEFAULT_JURISDICTION, year=None):
+        return sorted({n for j, y, n in self._tables if j == jurisdiction and (year is None or y == year)})
+
+    def jurisdictions(self):
+        return sorted({j for j, _, _ in self._tables})
+
+
+@lru_cache(maxsize=None)
+def load_registry(path=DATA_FILE):
+    """데이터 파일을 프로세스당 한 번만 읽음 (모든 Streamlit 세션이 공유)"""
+    with open(path, encoding="utf-8") as f:
+        return TaxTableRegistry(json.load(f))
+
+
+def get_table(name, year=None, jurisdiction=DEFAULT_JURISDICTION):
+    return load_registry().get(name, year, jurisdiction)
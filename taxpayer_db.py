@@ -0,0 +1,119 @@
+import sqlite3
+import threading
+from datetime import datetime
+
+# -------------------------------
+# SQLite(WAL) 납세자 저장소
+# -------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS taxpayers (
+    name TEXT PRIMARY KEY,
+    income REAL NOT NULL,
+    tax REAL NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_taxpayers_income ON taxpayers (income);
+CREATE INDEX IF NOT EXISTS idx_taxpayers_updated ON taxpayers (updated_at);
+"""
+
+UPSERT = """
+INSERT INTO taxpayers (name, income, tax, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT(name) DO UPDATE SET
+    income = excluded.income,
+    tax = excluded.tax,
+    updated_at = excluded.updated_at
+"""
+
+
+class TaxpayerDB:
+    """납세자별 최신 계산 결과를 SQLite에 저장 (같은 이름은 덮어쓰기)
+
+    WAL 모드라서 여러 세션이 동시에 읽는 동안에도 쓰기가 막히지 않는다.
+    연결은 스레드마다 따로 만든다.
+    """
+
+    def __init__(self, path="tax_results.db"):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, taxpayer):
+        self.upsert_many([taxpayer])
+
+    def upsert_many(self, taxpayers):
+        now = datetime.now().isoformat(timespec="seconds")
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                UPSERT,
+                ((t["name"], t["income"], t["tax"], now) for t in taxpayers),
+            )
+
+    def get(self, name):
+        row = self._conn().execute(
+            "SELECT name, income, tax, updated_at FROM taxpayers WHERE name = ?", (name,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def by_income(self, low, high, limit=1000):
+        """소득이 low 이상 high 이하인 납세자 (소득 순)"""
+        rows = self._conn().execute(
+            "SELECT name, income, tax, updated_at FROM taxpayers "
+            "WHERE income BETWEEN ? AND ? ORDER BY income LIMIT ?",
+            (low, high, limit),
+        )
+        return [dict(r) for r in rows]
+
+    def recent(self, limit=100, offset=0):
+        """최근에 저장된 순서로 일부만 조회"""
+        rows = self._conn().execute(
+            "SELECT name, income, tax, updated_at FROM taxpayers "
+            "ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+        return [dict(r) for r in rows]
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM taxpayers").fetchone()[0]
+
+    def bracket_totals(self, table):
+        """세율표(tax_engine.BracketTable) 구간별 인원, 소득 합계, 세금 합계
+
+        BracketTable.summarize처럼 모든 구간을 bracket_names() 이름으로 돌려주며,
+        해당하는 납세자가 없는 구간은 0으로 채운다.
+        """
+        thresholds = [float(t) for t in table.thresholds]
+        if thresholds:
+            case = "CASE " + " ".join(
+                f"WHEN income <= ? THEN {i}" for i in range(len(thresholds))
+            ) + f" ELSE {len(thresholds)} END"
+        else:
+            case = "0"  # 단일 세율표는 구간이 하나뿐
+        rows = self._conn().execute(
+            f"SELECT {case} AS bracket, COUNT(*) AS count, "
+            "SUM(income) AS income, SUM(tax) AS tax "
+            "FROM taxpayers GROUP BY bracket ORDER BY bracket",
+            thresholds,
+        )
+        totals = {r["bracket"]: r for r in rows}
+        result = []
+        for i, name in enumerate(table.bracket_names()):
+            r = totals.get(i)
+            result.append({
+                "bracket": name,
+                "count": r["count"] if r else 0,
+                "income": r["income"] if r else 0.0,
+                "tax": r["tax"] if r else 0.0,
+            })
+        return result
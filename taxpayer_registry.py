@@ -0,0 +1,272 @@
+import csv
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from taxpayer_store import TaxpayerStore, file_lock
+
+
+def taxpayer_key(record):
+    """고정 ID가 있으면 그대로, 없으면 이름 해시를 키로 사용"""
+    if record.get("id"):
+        return str(record["id"])
+    return hashlib.sha1(str(record["name"]).strip().encode("utf-8")).hexdigest()[:16]
+
+
+def _parse_value(value):
+    """CSV 스냅샷에서 읽은 문자열을 변경 로그(JSON)와 같은 숫자 자료형으로 되돌림"""
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+# -------------------------------
+# 중복 없는 납세자 레지스트리
+# -------------------------------
+class TaxpayerRegistry:
+    """납세자별 최신 상태만 유지하는 CSV 스냅샷 + 추가 전용 변경 로그
+
+    upsert()는 변경 로그(JSON 한 줄)를 메모리 버퍼에만 쌓고, buffer_size를 넘거나
+    flush() 또는 조회를 할 때 로그 잠금을 잡은 상태로 한꺼번에 덧붙인다.
+    기록 자체는 메모리에 두지 않고 위치 색인만 유지한다:
+    스냅샷은 TaxpayerStore의 id -> 줄 위치 색인, 로그는 키 -> 마지막 줄 위치.
+    로그가 살아 있는 기록 수의 compact_ratio배를 넘으면 compact()가
+    최신 상태만 담은 스냅샷을 새로 쓰고 로그를 비운다.
+    다른 프로세스가 덧붙인 로그는 refresh()에서 이어서 색인한다.
+    """
+
+    def __init__(self, filename="tax_results.csv", fieldnames=("name", "income", "tax"),
+                 log_filename=None, compact_ratio=2.0, min_log_entries=1000, buffer_size=1000):
+        self.filename = filename
+        self.log_filename = log_filename or os.path.splitext(filename)[0] + ".log"
+        self.fieldnames = ["id"] + [f for f in fieldnames if f != "id"]
+        self.compact_ratio = compact_ratio
+        self.min_log_entries = min_log_entries
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._lock = threading.Lock()
+        with self._lock, open(self.log_filename, "ab") as log, file_lock(log):
+            self._import_legacy()
+            self._reload()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    # ---- 읽기 ----
+    def get(self, name=None, key=None):
+        if key is None:
+            key = taxpayer_key({"name": name})
+        with self._lock:
+            self._flush_locked()
+            with self._shared_log_lock():
+                self._refresh_locked()
+                return self._read_locked(key)
+
+    def records(self):
+        with self._lock:
+            self._flush_locked()
+            with self._shared_log_lock():
+                self._refresh_locked()
+                return list(self._iter_records_locked())
+
+    def __len__(self):
+        with self._lock:
+            self._flush_locked()
+            self._refresh()
+            return self._count
+
+    def refresh(self):
+        with self._lock:
+            self._refresh()
+
+    # ---- 쓰기 ----
+    def upsert(self, record):
+        return self.upsert_many([record])[0]
+
+    def upsert_many(self, records):
+        entries = []
+        for record in records:
+            key = taxpayer_key(record)
+            row = {f: record.get(f) for f in self.fieldnames}
+            row["id"] = key
+            entries.append({"k": key, "r": row})
+        self._append(entries)
+        return [e["k"] for e in entries]
+
+    def delete(self, name=None, key=None):
+        if key is None:
+            key = taxpayer_key({"name": name})
+        self._append([{"k": key, "d": 1}])
+
+    def flush(self):
+        """버퍼에 쌓인 변경을 로그 잠금 상태에서 한 번에 기록"""
+        with self._lock:
+            self._flush_locked()
+
+    def compact(self):
+        """최신 상태만 스냅샷에 다시 쓰고 변경 로그를 비움"""
+        with self._lock:
+            self._flush_locked()
+            with open(self.log_filename, "ab") as log, file_lock(log):
+                self._refresh_locked()
+                self._compact_locked(log)
+
+    # ---- 내부 ----
+    def _append(self, entries):
+        with self._lock:
+            self._buffer.extend(entries)
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        entries, self._buffer = self._buffer, []
+        data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries).encode("utf-8")
+        with open(self.log_filename, "ab") as log, file_lock(log):
+            self._refresh_locked()
+            log.write(data)
+            log.flush()
+            self._refresh_locked()
+            if (self._log_entries >= self.min_log_entries
+                    and self._log_entries > self.compact_ratio * max(self._count, 1)):
+                self._compact_locked(log)
+
+    def _compact_locked(self, log):
+        # 로그 배타 잠금을 잡은 채로 스냅샷 교체 ~ 로그 비우기를 끝냄
+        tmp = self.filename + ".tmp"
+        self._write_snapshot(tmp, self._iter_records_locked())
+        os.replace(tmp, self.filename)
+        log.truncate(0)
+        self._reload()
+
+    def _write_snapshot(self, path, records):
+        if os.path.exists(path):
+            os.remove(path)
+        with TaxpayerStore(path, self.fieldnames, buffer_size=self.buffer_size, key_field="id") as store:
+            for record in records:
+                store.add(record)
+
+    def _from_csv(self, row):
+        # id / name 외의 열은 숫자로 바꿔 변경 로그에서 읽은 기록과 자료형을 맞춤
+        return {
+            k: row.get(k) if k in ("id", "name") else _parse_value(row.get(k))
+            for k in self.fieldnames
+        }
+
+    def _snapshot_id(self):
+        try:
+            st = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    @contextmanager
+    def _shared_log_lock(self):
+        # 다른 프로세스의 압축(스냅샷 교체 ~ 로그 비우기) 도중에는 읽지 않도록 공유 잠금
+        with open(self.log_filename, "ab") as log, file_lock(log, shared=True):
+            yield
+
+    def _import_legacy(self):
+        """id 열이 없는 예전 tax_results.csv(name,income,tax 추가 기록)를 스냅샷 형식으로 바꿈
+
+        taxpayer_key()로 키를 만들며, 같은 이름은 마지막 줄이 남는다.
+        """
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames is None or "id" in reader.fieldnames:
+                return
+            latest = {}
+            for row in reader:
+                record = self._from_csv(row)
+                record["id"] = taxpayer_key(row)
+                latest[record["id"]] = record
+        tmp = self.filename + ".tmp"
+        self._write_snapshot(tmp, latest.values())
+        os.replace(tmp, self.filename)
+
+    def _reload(self):
+        """스냅샷 색인을 다시 만들고 로그를 처음부터 색인 (로그 잠금을 잡은 상태에서 호출)"""
+        self._log_index = {}
+        self._log_offset = 0
+        self._log_entries = 0
+        self._snapshot = self._snapshot_id()
+        self._store = TaxpayerStore(self.filename, self.fieldnames, buffer_size=self.buffer_size, key_field="id")
+        self._store.refresh_index()
+        self._count = len(self._store)
+        self._refresh_locked()
+
+    def _refresh(self):
+        with self._shared_log_lock():
+            self._refresh_locked()
+
+    def _refresh_locked(self):
+        """아직 색인하지 않은 로그 부분만 읽음 (다른 프로세스가 압축했으면 전체 다시 색인)"""
+        if self._snapshot_id() != self._snapshot:
+            self._reload()
+            return
+        if not os.path.exists(self.log_filename):
+            return
+        size = os.path.getsize(self.log_filename)
+        if size == self._log_offset:
+            return
+        with open(self.log_filename, "rb") as f:
+            f.seek(self._log_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # 아직 쓰는 중인 줄
+                entry = json.loads(line)
+                key = entry["k"]
+                live = not entry.get("d")
+                self._count += live - self._is_live(key)
+                self._log_index[key] = self._log_offset if live else None
+                self._log_offset += len(line)
+                self._log_entries += 1
+
+    def _is_live(self, key):
+        if key in self._log_index:
+            return self._log_index[key] is not None
+        return key in self._store
+
+    def _read_locked(self, key):
+        """색인 위치의 한 줄만 읽어 기록 하나를 돌려줌"""
+        if key in self._log_index:
+            offset = self._log_index[key]
+            if offset is None:
+                return None
+            with open(self.log_filename, "rb") as f:
+                f.seek(offset)
+                return json.loads(f.readline())["r"]
+        rows = self._store.lookup(key)
+        return self._from_csv(rows[-1]) if rows else None
+
+    def _iter_records_locked(self):
+        """최신 기록을 스냅샷 순서, 로그 순서로 한 줄씩 읽어 돌려줌"""
+        if self._snapshot is not None:
+            with open(self.filename, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    if row.get("id") not in self._log_index:
+                        yield self._from_csv(row)
+        if self._log_offset:
+            with open(self.log_filename, "rb") as f:
+                offset = 0
+                while offset < self._log_offset:
+                    line = f.readline()
+                    entry = json.loads(line)
+                    if self._log_index.get(entry["k"]) == offset:
+                        yield entry["r"]
+                    offset += len(line)
@@ -0,0 +1,166 @@
+import csv
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# -------------------------------
+# 파일 잠금
+# -------------------------------
+@contextmanager
+def file_lock(f, shared=False):
+    """열린 파일 전체에 잠금을 걺 (shared=True 이면 읽기용 공유 잠금, Windows는 항상 배타적)"""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# -------------------------------
+# 납세자 저장소
+# -------------------------------
+class _LineCollector(list):
+    """csv writer가 쓰는 줄을 하나씩 모으는 리스트"""
+
+    def write(self, line):
+        self.append(line)
+
+
+class TaxpayerStore:
+    """납세자 기록을 모아서 한 번에 CSV에 추가하고, 이름별 위치 색인을 유지
+
+    add()는 메모리 버퍼에만 쌓고 buffer_size를 넘거나 flush()를 부를 때
+    파일 잠금을 잡은 상태로 한꺼번에 기록한다.
+    lookup()은 이름 -> 줄 시작 위치(byte offset) 색인으로 해당 줄만 읽는다.
+    key_field를 바꾸면 이름 대신 그 열(예: id)로 색인한다.
+    (값 안에 줄바꿈이 들어간 기록은 지원하지 않음)
+    """
+
+    def __init__(self, filename="tax_results.csv", fieldnames=("name", "income", "tax"), buffer_size=1000,
+                 key_field="name"):
+        self.filename = filename
+        self.fieldnames = list(fieldnames)
+        self.key_field = key_field
+        self._key_col = self.fieldnames.index(key_field)
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._index = {}
+        self._indexed_size = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def __len__(self):
+        """색인된 서로 다른 키 수 (refresh_index() 이후 기준)"""
+        with self._lock:
+            return len(self._index)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._index
+
+    def add(self, record):
+        with self._lock:
+            self._buffer.append(record)
+            full = len(self._buffer) >= self.buffer_size
+        if full:
+            self.flush()
+
+    def add_many(self, records):
+        with self._lock:
+            self._buffer.extend(records)
+        self.flush()
+
+    def flush(self):
+        """버퍼에 쌓인 기록을 잠금 상태에서 파일 끝에 한 번에 기록"""
+        with self._lock:
+            if not self._buffer:
+                return
+            records, self._buffer = self._buffer, []
+
+            with open(self.filename, "ab") as f, file_lock(f):
+                f.seek(0, os.SEEK_END)
+                start = f.tell()
+                # 잠금을 잡기 전에 다른 프로세스가 추가한 부분부터 색인
+                self._update_index(start)
+
+                lines = _LineCollector()
+                writer = csv.DictWriter(lines, fieldnames=self.fieldnames)
+                if start == 0:
+                    writer.writeheader()
+                writer.writerows(records)
+                encoded = [line.encode("utf-8") for line in lines]
+
+                offset = start
+                body = encoded
+                if start == 0:
+                    offset += len(encoded[0])
+                    body = encoded[1:]
+                for record, line in zip(records, body):
+                    self._index.setdefault(str(record[self.key_field]), []).append(offset)
+                    offset += len(line)
+
+                f.write(b"".join(encoded))
+                self._indexed_size = offset
+
+    def refresh_index(self):
+        """다른 프로세스가 파일 끝에 추가한 부분까지 색인"""
+        with self._lock:
+            if os.path.exists(self.filename):
+                self._update_index(os.path.getsize(self.filename))
+
+    def lookup(self, key):
+        """키(기본은 이름)에 해당하는 모든 기록을 저장 순서대로 돌려줌"""
+        self.flush()
+        with self._lock:
+            if not os.path.exists(self.filename):
+                return []
+            self._update_index(os.path.getsize(self.filename))
+            offsets = list(self._index.get(key, []))
+
+            rows = []
+            with open(self.filename, "rb") as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    line = f.readline().decode("utf-8")
+                    values = next(csv.reader([line]))
+                    rows.append(dict(zip(self.fieldnames, values)))
+            return rows
+
+    def _update_index(self, end):
+        """아직 색인하지 않은 파일 구간(_indexed_size ~ end)을 읽어 색인에 추가"""
+        if end <= self._indexed_size:
+            return
+        with open(self.filename, "rb") as f:
+            f.seek(self._indexed_size)
+            offset = self._indexed_size
+            while offset < end:
+                line = f.readline()
+                if not line:
+                    break
+                if offset > 0:
+                    values = next(csv.reader([line.decode("utf-8")]), None)
+                    if values:
+                        self._index.setdefault(values[self._key_col], []).append(offset)
+                offset += len(line)
+        self._indexed_size = offset
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 import difflib
+from walk_engine import DELOAD_FACTOR, PROGRAM_PRESETS, iter_week_schedule
 
 st.set_page_config(page_title="30대 걷기 챗봇", layout="wide")
 
@@ -22,12 +23,14 @@ def calc_recommended_minutes(age, sex, activity_level, goal):
     return int(round(daily)), int(round(weekly))
 
 
-def generate_4week_plan(weekly_minutes, goal):
+def iter_week_plan(weekly_minutes, goal, n_weeks=4):
+    # yields one week at a time; 12/24/52-week programs get deload weeks and a progression cap
     base_session = weekly_minutes / 5
-    plan = []
 
-    for week in range(1, 5):
-        factor = 0.85 + (week - 1) * 0.05
+    for week, progress, deload in iter_week_schedule(n_weeks, **PROGRAM_PRESETS[n_weeks]):
+        factor = 0.85 + (progress - 1) * 0.05
+        if deload:
+            factor *= DELOAD_FACTOR
         session_time = int(round(base_session * factor))
 
         if goal == "유지/건강한 생활":
@@ -40,17 +43,18 @@ def generate_4week_plan(weekly_minutes, goal):
             intensity = "심폐 강화용 빠른 걷기"
             tip = "빠른 보행 + 오르막 또는 계단 걷기, 심박수 70% 유지"
 
-        plan.append({
-            "주차": f"{week}주차",
+        yield {
+            "주차": f"{week}주차(회복)" if deload else f"{week}주차",
             "주간 총 시간": int(round(weekly_minutes * factor)),
             "1회 운동 시간": session_time,
-            "운동 강도": intensity,
+            "운동 강도": "회복 주간: 편안한 속도" if deload else intensity,
             "설명": f"워밍업 5분 → 메인 {session_time - 10}분 → 쿨다운 5분",
             "포인트": tip
-        })
+        }
 
-    df = pd.DataFrame(plan)
-    return df
+
+def generate_4week_plan(weekly_minutes, goal, n_weeks=4):
+    return pd.DataFrame(iter_week_plan(weekly_minutes, goal, n_weeks))
 
 
 def find_best_answer(question, kb, n=1):
@@ -116,11 +120,12 @@ with col1:
     st.info("세계보건기구 권장: 주 150분 중간강도 또는 75분 고강도 운동.")
 
 with col2:
-    st.subheader("4주 걷기 루틴 생성")
-    if st.button("4주 루틴 보기"):
-        df = generate_4week_plan(recommended_weekly, goal)
+    st.subheader("걷기 루틴 생성")
+    program_weeks = st.selectbox("프로그램 기간(주)", list(PROGRAM_PRESETS), index=0)
+    if st.button("루틴 보기"):
+        df = generate_4week_plan(recommended_weekly, goal, program_weeks)
         st.dataframe(df, use_container_width=True)
-        st.success(f"{goal} 목표에 맞춘 4주 루틴이 생성되었습니다!")
+        st.success(f"{goal} 목표에 맞춘 {program_weeks}주 루틴이 생성되었습니다!")
 
 st.markdown("---")
 
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 import difflib
+from walk_engine import DELOAD_FACTOR, PROGRAM_PRESETS, iter_week_schedule
 
 st.set_page_config(page_title="30–50대 개인 맞춤 걷기 챗봇", layout="wide")
 
@@ -103,27 +104,28 @@ def compute_recommendation(age, weight, height, sex, activity_level, goal, bpi,
 
     return {"weekly": weekly, "daily": daily, "notes": notes}
 
-def generate_4week_plan(goal, weekly_minutes, sessions_per_week, condition_notes):
-    plan = []
-    for week in range(1, 5):
+def iter_program_plan(goal, weekly_minutes, sessions_per_week, condition_notes, n_weeks=4):
+    # generator: weeks are produced lazily; 12/24/52-week programs get deload weeks and a progression cap
+    for week, progress, deload in iter_week_schedule(n_weeks, **PROGRAM_PRESETS[n_weeks]):
         if goal == "체중 감량":
-            factor = 0.9 + 0.05 * week
+            factor = 0.9 + 0.05 * progress
         elif goal == "심폐 지구력 향상":
-            factor = 0.92 + 0.06 * week
+            factor = 0.92 + 0.06 * progress
         else:
-            factor = 0.85 + 0.04 * week
+            factor = 0.85 + 0.04 * progress
+        if deload:
+            factor *= DELOAD_FACTOR
 
         total = int(weekly_minutes * factor)
         per_session = int(total / sessions_per_week)
         note = condition_notes[0] if condition_notes else ""
 
-        plan.append({
-            "주차": f"{week}주차",
+        yield {
+            "주차": f"{week}주차(회복)" if deload else f"{week}주차",
             "주간 총 시간(분)": total,
             "1회 평균(분)": per_session,
             "추천 내용": f"워밍업 5분 + 주행 {per_session-10}분 + 쿨다운 5분 — {note}"
-        })
-    return plan
+        }
 
 def find_best_answer(q, kb):
     matches = difflib.get_close_matches(q, list(kb.keys()), n=2, cutoff=0.45)
@@ -160,7 +162,11 @@ with st.sidebar:
     rhr = st.number_input("안정시 심박수(bpm)", 40, 120, 75)
     glucose = st.selectbox("혈당 상태", ["정상", "경계", "고혈당"])
 
+# the button only switches the results on, so the routine options below keep their values on rerun
 if st.button("권장 걷기 시간 계산"):
+    st.session_state.show_plan = True
+
+if st.session_state.get("show_plan"):
     result = compute_recommendation(age, weight, height, sex, activity, goal, bpi, rhr, glucose)
     st.subheader("📊 개인 맞춤 결과")
     st.write(f"- 주간 권장 시간: **{result['weekly']}분**")
@@ -169,9 +175,10 @@ if st.button("권장 걷기 시간 계산"):
         st.write("•", n)
 
     st.markdown("---")
-    st.subheader("🏅 4주 맞춤 루틴")
+    st.subheader("🏅 맞춤 루틴")
     sessions = st.slider("주당 세션 수", 3, 7, 5)
-    plan = generate_4week_plan(goal, result["weekly"], sessions, result["notes"])
+    program_weeks = st.selectbox("프로그램 기간(주)", list(PROGRAM_PRESETS), index=0)
+    plan = iter_program_plan(goal, result["weekly"], sessions, result["notes"], program_weeks)
 
     for p in plan:
         st.markdown(f"**{p['주차']}** — 총 {p['주간 총 시간(분)']}분, 1회 {p['1회 평균(분)']}분")
@@ -3,74 +3,35 @@ import pandas as pd
 from datetime import datetime
 import difflib
 import math
+import time
+from tax_export import iter_csv_chunks
+from walk_engine import (
+    CONDITION_MATCHER,
+    LRUCache,
+    PLAN_CSV_HEADER,
+    PROGRAM_PRESETS,
+    activity_modifier,
+    age_modifier,
+    bmi_category,
+    bmi_modifier,
+    build_plan,
+    calc_bmi,
+    compute_recommendations,
+    iter_plan_rows,
+    plan_key,
+    recommendation_key,
+)
 
 st.set_page_config(page_title="30-50대 개인화 걷기 챗봇", layout="wide")
 
 # ------------------ Helpers ------------------
-
-def calc_bmi(weight_kg, height_cm):
-    if height_cm <= 0:
-        return None
-    h = height_cm / 100.0
-    return round(weight_kg / (h * h), 1)
-
-
-def age_modifier(age):
-    # small conservative modifier: older adults may progress slightly slower
-    if age < 35:
-        return 1.0
-    elif age < 40:
-        return 0.98
-    elif age < 45:
-        return 0.96
-    elif age < 50:
-        return 0.94
-    else:
-        return 0.92
-
-
-def bmi_modifier(bmi, goal):
-    # If user aims for weight loss and BMI >= 25, recommend higher weekly minutes
-    if bmi is None:
-        return 1.0
-    if goal == "체중 감량":
-        if bmi >= 30:
-            return 1.4
-        elif bmi >= 25:
-            return 1.25
-        else:
-            return 1.1
-    else:
-        return 1.0
-
-
-def activity_modifier(activity_level):
-    return {"비활동적": 1.0, "보통": 0.95, "매우 활동적": 0.9}.get(activity_level, 1.0)
-
+# calc_bmi / age_modifier / bmi_modifier / activity_modifier / bmi_category
+# come from the shared breakpoint tables in walk_engine.py
 
 def health_condition_adjustments(conditions):
     # returns a string warning and a safety factor (<=1 reduces recommended volume)
-    if not conditions:
-        return "", 1.0
-    cond = [c.strip().lower() for c in conditions.split(",")]
-    warning = []
-    factor = 1.0
-    for c in cond:
-        if not c:
-            continue
-        if any(x in c for x in ["심장", "심근", "협심증", "심부전"]):
-            warning.append("심혈관 질환이 의심되거나 진단된 경우, 운동 시작 전 의사 상담 권장")
-            factor = min(factor, 0.7)
-        if any(x in c for x in ["고혈압", "혈압"]):
-            warning.append("고혈압이 있으면 강도 조절과 의사 상담을 권장")
-            factor = min(factor, 0.85)
-        if any(x in c for x in ["관절", "무릎", "관절염"]):
-            warning.append("관절 문제가 있으면 충격을 줄이는 방식(부드러운 지면, 짧은 세션) 권장")
-            factor = min(factor, 0.8)
-        if "임신" in c:
-            warning.append("임신 중일 경우 전문의 상담 필요")
-            factor = min(factor, 0.6)
-    return "; ".join(warning), factor
+    # keyword rules live in walk_engine.CONDITION_RULES, matched in a single pass
+    return CONDITION_MATCHER(conditions)
 
 
 def compute_recommendation(age, weight, height, sex, activity_level, goal, conditions, weekly_target_override=None):
@@ -110,68 +71,75 @@ def compute_recommendation(age, weight, height, sex, activity_level, goal, condi
     }
 
 
-def bmi_category(bmi):
-    if bmi is None:
-        return "측정불가"
-    if bmi < 18.5:
-        return "저체중"
-    elif bmi < 23:
-        return "정상"
-    elif bmi < 25:
-        return "과체중(경계)"
-    elif bmi < 30:
-        return "과체중"
-    else:
-        return "비만"
-
-
 def generate_personalized_4week(age, weight, height, goal, weekly_minutes, sessions_per_week, intensity_pref):
     # Build progressive 4-week plan. intensity_pref: '보통','인터벌','빠르게'
-    plan = []
-    weekly = weekly_minutes
-    for w in range(1, 5):
-        # progressive increase depending on goal
-        if goal == "체중 감량":
-            week_factor = 0.9 + 0.05 * w
-        elif goal == "심폐 지구력 향상":
-            week_factor = 0.92 + 0.06 * w
-        else:
-            week_factor = 0.85 + 0.04 * w
-
-        week_total = int(round(weekly * week_factor))
-        per_session = max(10, int(round(week_total / sessions_per_week)))
-
-        # Build session breakdown
-        sessions = []
-        for s in range(sessions_per_week):
-            if goal == "체중 감량":
-                if intensity_pref == "인터벌":
-                    # Example interval session
-                    main = f"인터벌: 3분 보통 + 1분 빠르게 x {max(1, per_session//4)}세트"
-                else:
-                    main = f"지속 빠른 걷기 {max(0, per_session-10)}분"
-            elif goal == "심폐 지구력 향상":
-                if intensity_pref == "인터벌":
-                    main = f"인터벌(고강도) 1분/2분 반복, 총 {max(0, per_session-10)}분"
-                else:
-                    main = f"빠른 보행/오르막 포함 {max(0, per_session-10)}분"
-            else:
-                main = f"편안한 속도 지속 {max(0, per_session-10)}분"
-
-            sessions.append({
-                "세션번호": s + 1,
-                "세션시간(분)": per_session,
-                "내용": f"워밍업 5분 → {main} → 쿨다운 5분"
-            })
-
-        plan.append({
-            "주차": f"{w}주차",
-            "주간총시간(분)": week_total,
-            "1회시간(분)": per_session,
-            "세션수": sessions_per_week,
-            "세부세션": sessions
-        })
-    return plan
+    # returns a compact walk_engine.WalkPlan; text is rendered when shown/exported
+    return generate_personalized_program(goal, weekly_minutes, sessions_per_week, intensity_pref, n_weeks=4)
+
+
+def generate_personalized_program(goal, weekly_minutes, sessions_per_week, intensity_pref, n_weeks):
+    # 12/24/52-week programs add deload weeks and a progression cap (PROGRAM_PRESETS)
+    return build_plan(goal, weekly_minutes, sessions_per_week, intensity_pref, n_weeks, **PROGRAM_PRESETS[n_weeks])
+
+
+# ------------------ Cached wrappers ------------------
+# Streamlit reruns the whole script on every widget change; these keep the
+# results across reruns, keyed on the normalized inputs.
+
+@st.cache_resource
+def get_result_caches():
+    return {
+        "recommendation": LRUCache(maxsize=2048, ttl=3600),
+        "plan": LRUCache(maxsize=2048, ttl=3600),
+    }
+
+
+def cached_recommendation(age, weight, height, sex, activity_level, goal, conditions, weekly_target_override=None):
+    key = recommendation_key(age, weight, height, activity_level, goal, conditions, weekly_target_override)
+    return get_result_caches()["recommendation"].get_or_compute(
+        key,
+        lambda: compute_recommendation(age, weight, height, sex, activity_level, goal, conditions, weekly_target_override),
+    )
+
+
+def cached_personalized_program(goal, weekly_minutes, sessions_per_week, intensity_pref, n_weeks=4):
+    key = plan_key(goal, weekly_minutes, sessions_per_week, intensity_pref, n_weeks)
+    return get_result_caches()["plan"].get_or_compute(
+        key,
+        lambda: generate_personalized_program(goal, weekly_minutes, sessions_per_week, intensity_pref, n_weeks),
+    )
+
+
+# ------------------ Plan rendering ------------------
+# Every st.* call is a separate frontend element (one websocket delta each);
+# the one-shot modes send the whole plan as a single element.
+PLAN_RENDER_MODES = ["텍스트 (한 번에)", "표 (한 번에)", "주차별 (기존)"]
+
+
+@st.cache_data(max_entries=256)
+def plan_markdown(plan_hash, _plan):
+    return _plan.to_markdown()
+
+
+@st.cache_data(max_entries=256)
+def plan_table(plan_hash, _plan):
+    return _plan.to_frame()
+
+
+def render_plan(plan, mode):
+    # returns the number of elements emitted
+    if mode == PLAN_RENDER_MODES[0]:
+        st.markdown(plan_markdown(plan.digest(), plan))
+        return 1
+    if mode == PLAN_RENDER_MODES[1]:
+        st.dataframe(plan_table(plan.digest(), plan), use_container_width=True)
+        return 1
+    for i in range(len(plan)):
+        st.markdown(f"### {plan.week_title(i)}")
+        for s in plan.week_sessions(i):
+            st.write(f"• 세션 {s['session']}: {s['minutes']}분 — {plan.session_text(s)}")
+        st.markdown("---")
+    return 2 * len(plan) + len(plan.sessions)
 
 
 def find_best_answer(question, kb, n=2):
@@ -205,13 +173,23 @@ with st.sidebar:
     activity_level = st.selectbox("평소 활동 수준", ["비활동적", "보통", "매우 활동적"], index=1)
     goal = st.selectbox("주요 목표", ["유지/건강한 생활", "체중 감량", "심폐 지구력 향상"])
     conditions = st.text_input("기저질환/특이사항 (콤마로 구분, 예: 고혈압, 무릎 관절)")
-    weekly_override = st.number_input("직접 설정할 주간 목표(분, 원하면 입력)", min_value=0, value=0)
+    weekly_override = st.number_input("직접 설정할 주간 목표(분, 원하면 입력)", min_value=0, max_value=10080, value=0)
     st.markdown("---")
     st.info("앱은 교육용입니다. 만약 심장질환·임신 등 특이상황이 있으면 전문가 상담을 먼저 받으세요.")
+    with st.expander("계산 캐시 상태"):
+        for cache_name, cache in get_result_caches().items():
+            stats = cache.stats()
+            st.caption(f"{cache_name}: 적중 {stats['hits']} / 미스 {stats['misses']} "
+                       f"({stats['hit_rate']:.0%}), {stats['size']}/{stats['maxsize']}개")
 
 # Compute recommendation
+# The button only switches the results on; keeping that in session_state lets the
+# plan options below survive their own reruns (results are cached per input).
 if st.button("권장 시간 계산 및 4주 루틴 생성"):
-    rec = compute_recommendation(age, weight, height, sex, activity_level, goal, conditions, weekly_override if weekly_override>0 else None)
+    st.session_state.show_plan = True
+
+if st.session_state.get("show_plan"):
+    rec = cached_recommendation(age, weight, height, sex, activity_level, goal, conditions, weekly_override if weekly_override>0 else None)
     st.subheader("개인화 권장 결과")
     st.write(f"- 주간 권장(추정): {rec['weekly_minutes']} 분/주")
     st.write(f"- 일일 평균(추정): {rec['daily_minutes']} 분/일")
@@ -223,35 +201,53 @@ if st.button("권장 시간 계산 및 4주 루틴 생성"):
             st.write(f"  - {n}")
 
     st.markdown("---")
-    st.subheader("4주 맞춤 루틴 옵션")
+    st.subheader("맞춤 루틴 옵션")
     sessions_per_week = st.slider("주당 세션 수", 3, 7, 5)
     intensity_pref = st.selectbox("선호 강도 유형", ["보통", "인터벌", "빠르게"], index=0)
+    program_weeks = st.selectbox("프로그램 기간(주)", list(PROGRAM_PRESETS), index=0,
+                                 help="12주 이상은 4주마다 회복 주간이 들어가고 증가폭에 상한이 있습니다.")
 
-    plan = generate_personalized_4week(age, weight, height, goal, rec['weekly_minutes'], sessions_per_week, intensity_pref)
+    render_mode = st.radio("루틴 표시 방식", PLAN_RENDER_MODES, horizontal=True)
+    show_render_stats = st.checkbox("렌더링 측정 보기")
+
+    plan = cached_personalized_program(goal, rec['weekly_minutes'], sessions_per_week, intensity_pref, program_weeks)
 
     # Show plan in readable format
-    for w in plan:
-        st.markdown(f"### {w['주차']} — 주간 총 {w['주간총시간(분)']}분, 1회 약 {w['1회시간(분)']}분, 세션수 {w['세션수']}")
-        for s in w['세부세션']:
-            st.write(f"• 세션 {s['세션번호']}: {s['세션시간(분)']}분 — {s['내용']}")
-        st.markdown("---")
+    render_start = time.perf_counter()
+    elements = render_plan(plan, render_mode)
+    render_ms = (time.perf_counter() - render_start) * 1000
+    # last measurement per mode, so switching modes gives a before/after comparison
+    render_stats = st.session_state.setdefault("render_stats", {})
+    render_stats[render_mode] = {"표시 방식": render_mode, "화면 요소(개)": elements,
+                                 "서버 처리(ms)": round(render_ms, 1), "주차 수": len(plan)}
+    if show_render_stats:
+        st.caption("렌더링 측정 (방식을 바꾸면 각 방식의 마지막 측정값이 쌓입니다)")
+        st.table(list(render_stats.values()))
 
     # Exportable CSV summary
     if st.button("루틴 요약 CSV로 다운로드"):
-        rows = []
-        for w in plan:
-            for s in w['세부세션']:
-                rows.append({
-                    '주차': w['주차'],
-                    '세션번호': s['세션번호'],
-                    '세션시간(분)': s['세션시간(분)'],
-                    '내용': s['내용']
-                })
-        df = pd.DataFrame(rows)
-        csv = df.to_csv(index=False).encode('utf-8-sig')
+        # rows are rendered week by week straight into CSV chunks (no DataFrame)
+        csv = b"".join(iter_csv_chunks(iter_plan_rows(plan.iter_weeks()), header=PLAN_CSV_HEADER, encoding='utf-8-sig'))
         st.download_button("CSV 다운로드", data=csv, file_name=f"walk_plan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv", mime='text/csv')
 
 
+# ------------------ Cohort (batch) ------------------
+with st.expander("👥 회원 명단 일괄 계산 (CSV 업로드)"):
+    st.caption("열: age, weight, height, activity_level, goal, conditions (선택: weekly_target_override)")
+    roster_file = st.file_uploader("회원 명단 CSV", type=["csv"], key="roster")
+    if roster_file is not None:
+        members = pd.read_csv(roster_file)
+        required = ["age", "weight", "height", "activity_level", "goal", "conditions"]
+        missing = [c for c in required if c not in members.columns]
+        if missing:
+            st.error(f"필요한 열이 없습니다: {', '.join(missing)}")
+        else:
+            result = compute_recommendations(members, health_condition_adjustments)
+            st.write(f"- 회원 수: {len(result):,}명, 평균 주간 권장 {result['weekly_minutes'].mean():.0f}분")
+            st.dataframe(result.head(100), use_container_width=True)
+            st.download_button("결과 CSV 다운로드", data=result.to_csv(index=False).encode('utf-8-sig'),
+                               file_name=f"walk_cohort_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv", mime='text/csv')
+
 
 import pandas as pd
 
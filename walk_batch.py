@@ -0,0 +1,134 @@
+# Usage: python walk_batch.py roster.csv -o walk_output [--weeks 4] [--sessions 5] [--intensity 보통]
+#                             [--batch-size 10000] [--format csv|parquet] [--gzip] [--workers 4]
+#
+# Roster columns: age, weight, height, activity_level, goal, conditions
+# (optional: id, weekly_target_override, sessions_per_week, intensity_pref).
+# Each batch is written as members_NNNNN.* (recommendations) and plans_NNNNN.*
+# (one row per session), plus summary.csv. Parquet in/out needs pyarrow.
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from tax_export import iter_dataframe_csv, write_chunks
+from walk_engine import PROGRAM_PRESETS, build_plan_table, compute_recommendations
+
+REQUIRED = ["age", "weight", "height", "activity_level", "goal", "conditions"]
+DEFAULT_BATCH_SIZE = 10000
+
+
+# ------------------ Input ------------------
+
+def iter_roster(path, batch_size):
+    """Yield the roster batch_size rows at a time (never the whole file)."""
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=batch_size)
+
+
+def bounded_map(pool, func, items, window):
+    """pool.map that keeps at most `window` batches in flight, results in order.
+
+    Executor.map would submit (and so read) every batch up front.
+    """
+    pending = []
+    for item in items:
+        pending.append(pool.submit(func, *item))
+        if len(pending) >= window:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+
+# ------------------ One batch (runs in a worker process) ------------------
+
+def write_frame(df, path, fmt, compress):
+    if fmt == "parquet":
+        df.to_parquet(path.with_suffix(".parquet"), index=False)
+    else:
+        suffix = ".csv.gz" if compress else ".csv"
+        write_chunks(iter_dataframe_csv(df, encoding="utf-8-sig", compress=compress), path.with_suffix(suffix))
+
+
+def process_batch(index, members, out_dir, options):
+    start = time.perf_counter()
+    try:
+        missing = [c for c in REQUIRED if c not in members.columns]
+        if missing:
+            raise ValueError(f"필요한 열이 없습니다: {', '.join(missing)}")
+        result = compute_recommendations(members)
+        if "id" not in result.columns:
+            result.insert(0, "id", result.index)
+        sessions = result["sessions_per_week"] if "sessions_per_week" in result else options["sessions"]
+        intensity = result["intensity_pref"] if "intensity_pref" in result else options["intensity"]
+        n_weeks = options["weeks"]
+        plans = build_plan_table(result["goal"], result["weekly_minutes"], sessions, intensity,
+                                 n_weeks, **PROGRAM_PRESETS[n_weeks])
+        plans.insert(0, "id", result["id"].to_numpy()[plans.pop("member").to_numpy()])
+
+        write_frame(result, out_dir / f"members_{index:05d}", options["format"], options["gzip"])
+        write_frame(plans, out_dir / f"plans_{index:05d}", options["format"], options["gzip"])
+        return {"batch": index, "members": len(result), "sessions": len(plans),
+                "weekly_minutes_mean": round(result["weekly_minutes"].mean(), 1),
+                "seconds": round(time.perf_counter() - start, 3), "error": ""}
+    except Exception as e:
+        return {"batch": index, "members": len(members), "sessions": 0, "weekly_minutes_mean": None,
+                "seconds": round(time.perf_counter() - start, 3), "error": str(e)}
+
+
+# ------------------ Command line ------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="회원 명단 전체의 걷기 권장량과 루틴을 일괄 생성")
+    parser.add_argument("roster", type=Path, help="회원 명단 (.csv 또는 .parquet)")
+    parser.add_argument("-o", "--output-dir", type=Path, default=Path("walk_output"))
+    parser.add_argument("--weeks", type=int, choices=sorted(PROGRAM_PRESETS), default=4)
+    parser.add_argument("--sessions", type=int, default=5, help="sessions_per_week 열이 없을 때 주당 세션 수")
+    parser.add_argument("--intensity", default="보통", help="intensity_pref 열이 없을 때 선호 강도")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--gzip", action="store_true", help="CSV 결과를 .csv.gz로 압축")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" or args.roster.suffix.lower() == ".parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("Parquet 입출력에는 pyarrow 가 필요합니다 (pip install pyarrow)")
+    if not args.roster.exists():
+        parser.error(f"{args.roster} 파일이 없습니다.")
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    options = {"weeks": args.weeks, "sessions": args.sessions, "intensity": args.intensity,
+               "format": args.format, "gzip": args.gzip}
+
+    start = time.perf_counter()
+    batches = ((i, members, args.output_dir, options)
+               for i, members in enumerate(iter_roster(args.roster, args.batch_size)))
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = []
+        for r in bounded_map(pool, process_batch, batches, window=2 * (args.workers or 1)):
+            results.append(r)
+            print(f"  batch {r['batch']:>5}: {r['members']:,}명 {r['sessions']:,}세션 "
+                  f"{r['seconds']:.2f}초 {r['error']}")
+    elapsed = time.perf_counter() - start
+
+    summary = pd.DataFrame(results, columns=["batch", "members", "sessions", "weekly_minutes_mean", "seconds", "error"])
+    summary.to_csv(args.output_dir / "summary.csv", index=False, encoding="utf-8-sig")
+
+    failed = (summary["error"] != "").sum()
+    print(f"✅ {summary['members'].sum():,}명, {summary['sessions'].sum():,}세션 ({elapsed:.2f}초, 실패 배치 {failed}개)")
+    print(f"📄 요약: {args.output_dir / 'summary.csv'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
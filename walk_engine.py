@@ -0,0 +1,609 @@
+import bisect
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+# ------------------ Constants ------------------
+
+BASE_WEEKLY_BY_GOAL = {"심폐 지구력 향상": 200, "체중 감량": 225}
+DEFAULT_BASE_WEEKLY = 150  # WHO 150 min moderate
+ACTIVITY_MODIFIERS = {"비활동적": 1.0, "보통": 0.95, "매우 활동적": 0.9}
+MIN_WEEKLY_MINUTES = 60
+
+
+# ------------------ Breakpoint tables ------------------
+
+class PiecewiseTable:
+    """Step function compiled from (upper_bound, value) rows plus a default.
+
+    A value x gets the value of the first row with x < upper_bound, or the
+    default above the last bound. Scalars are looked up with bisect and
+    arrays with np.digitize, both against the same sorted bounds.
+    """
+
+    def __init__(self, rows, default):
+        bounds = [b for b, _ in rows]
+        if bounds != sorted(bounds):
+            raise ValueError("breakpoints must be sorted")
+        self.bounds = bounds
+        self.values = [v for _, v in rows] + [default]
+        self._bounds_array = np.asarray(bounds, dtype=np.float64)
+        self._values_array = np.asarray(self.values, dtype=object if isinstance(default, str) else np.float64)
+
+    def __call__(self, x):
+        return self.values[bisect.bisect_right(self.bounds, x)]
+
+    def evaluate(self, xs):
+        return self._values_array[np.digitize(np.asarray(xs, dtype=np.float64), self._bounds_array)]
+
+
+# small conservative modifier: older adults may progress slightly slower
+AGE_MODIFIER_TABLE = PiecewiseTable([(35, 1.0), (40, 0.98), (45, 0.96), (50, 0.94)], 0.92)
+
+# weight-loss goal only: BMI >= 25 gets more weekly minutes
+WEIGHT_LOSS_BMI_TABLE = PiecewiseTable([(25, 1.1), (30, 1.25)], 1.4)
+
+BMI_CATEGORY_TABLE = PiecewiseTable(
+    [(18.5, "저체중"), (23, "정상"), (25, "과체중(경계)"), (30, "과체중")], "비만"
+)
+BMI_UNKNOWN = "측정불가"
+
+
+# ------------------ Condition matcher ------------------
+
+# (keywords, warning, safety factor); a factor <= 1 reduces recommended volume
+CONDITION_RULES = [
+    (["심장", "심근", "협심증", "심부전"], "심혈관 질환이 의심되거나 진단된 경우, 운동 시작 전 의사 상담 권장", 0.7),
+    (["고혈압", "혈압"], "고혈압이 있으면 강도 조절과 의사 상담을 권장", 0.85),
+    (["관절", "무릎", "관절염"], "관절 문제가 있으면 충격을 줄이는 방식(부드러운 지면, 짧은 세션) 권장", 0.8),
+    (["임신"], "임신 중일 경우 전문의 상담 필요", 0.6),
+]
+
+
+class ConditionMatcher:
+    """Aho-Corasick automaton over every keyword of a condition dictionary.
+
+    One left-to-right pass over the lowercased text finds all keyword hits;
+    each hit is attributed to its comma-separated item, and a rule warns at
+    most once per item (same output as the old per-item substring scans).
+    """
+
+    def __init__(self, rules=CONDITION_RULES, separator=","):
+        self.rules = [(list(k), w, f) for k, w, f in rules]
+        self.separator = separator
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [set()]
+        for rule_idx, (keywords, _, _) in enumerate(self.rules):
+            for keyword in keywords:
+                self._add(keyword.strip().lower(), rule_idx)
+        self._build_failure_links()
+
+    def _add(self, keyword, rule_idx):
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            node = nxt
+        self._out[node].add(rule_idx)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text):
+        """Sorted (item index, rule index) pairs that match in text."""
+        hits = set()
+        item = 0
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for ch in text.lower():
+            if ch == self.separator:
+                item += 1
+                node = 0
+                continue
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for rule_idx in out[node]:
+                hits.add((item, rule_idx))
+        return sorted(hits)
+
+    def canonical(self, conditions):
+        """Rule indices in output order; texts with equal keys get equal results."""
+        if not conditions:
+            return ()
+        return tuple(rule_idx for _, rule_idx in self.find(conditions))
+
+    def __call__(self, conditions):
+        """(warning text, minimum safety factor) like health_condition_adjustments."""
+        warnings = []
+        factor = 1.0
+        for rule_idx in self.canonical(conditions):
+            _, warning, rule_factor = self.rules[rule_idx]
+            warnings.append(warning)
+            factor = min(factor, rule_factor)
+        return "; ".join(warnings), factor
+
+    def match_many(self, texts):
+        """Screen a batch of intake texts; returns (warnings, factors) arrays."""
+        return condition_adjustments_by_unique(texts, self)
+
+
+CONDITION_MATCHER = ConditionMatcher()
+
+
+# ------------------ Compact plans ------------------
+
+# intensity codes stored per session; text is rendered only when displayed
+INTENSITY_EASY, INTENSITY_INTERVAL, INTENSITY_BRISK, INTENSITY_HIIT, INTENSITY_HILL = range(5)
+INTENSITY_MAIN_TEXT = {
+    INTENSITY_EASY: lambda m: f"편안한 속도 지속 {max(0, m - 10)}분",
+    INTENSITY_INTERVAL: lambda m: f"인터벌: 3분 보통 + 1분 빠르게 x {max(1, m // 4)}세트",
+    INTENSITY_BRISK: lambda m: f"지속 빠른 걷기 {max(0, m - 10)}분",
+    INTENSITY_HIIT: lambda m: f"인터벌(고강도) 1분/2분 반복, 총 {max(0, m - 10)}분",
+    INTENSITY_HILL: lambda m: f"빠른 보행/오르막 포함 {max(0, m - 10)}분",
+}
+
+# weekly progression: factor = start + step * week
+WEEK_FACTOR_BY_GOAL = {"체중 감량": (0.9, 0.05), "심폐 지구력 향상": (0.92, 0.06)}
+DEFAULT_WEEK_FACTOR = (0.85, 0.04)
+MIN_SESSION_MINUTES = 10
+
+# longer programs: every deload_every-th week is a lighter recovery week and
+# the progression stops climbing after max_progress_weeks regular weeks
+DELOAD_FACTOR = 0.7
+PROGRAM_PRESETS = {
+    4: {},
+    12: {"deload_every": 4, "max_progress_weeks": 8},
+    24: {"deload_every": 4, "max_progress_weeks": 10},
+    52: {"deload_every": 4, "max_progress_weeks": 12},
+}
+PLAN_CSV_HEADER = ["주차", "세션번호", "세션시간(분)", "내용"]
+
+# minutes are uint32: a large weekly override can exceed uint16's 65535
+WEEK_DTYPE = np.dtype([("week", np.uint16), ("total_minutes", np.uint32),
+                       ("session_minutes", np.uint32), ("sessions", np.uint8), ("deload", np.bool_)])
+SESSION_DTYPE = np.dtype([("week", np.uint16), ("session", np.uint8),
+                          ("minutes", np.uint32), ("intensity", np.uint8)])
+
+
+def iter_week_schedule(n_weeks=4, deload_every=None, max_progress_weeks=None):
+    """Yield (week, progress_week, is_deload) for an n_weeks program.
+
+    progress_week is the week number to plug into a progression formula: it
+    advances on regular weeks only, holds on deload weeks and stops at
+    max_progress_weeks. Without deloads or a cap it is just the week number.
+    """
+    progress = 0
+    for week in range(1, n_weeks + 1):
+        deload = bool(deload_every) and week % deload_every == 0
+        if not deload:
+            progress += 1
+            if max_progress_weeks:
+                progress = min(progress, max_progress_weeks)
+        yield week, max(progress, 1), deload
+
+
+def session_intensity(goal, intensity_pref):
+    if goal == "체중 감량":
+        return INTENSITY_INTERVAL if intensity_pref == "인터벌" else INTENSITY_BRISK
+    if goal == "심폐 지구력 향상":
+        return INTENSITY_HIIT if intensity_pref == "인터벌" else INTENSITY_HILL
+    return INTENSITY_EASY
+
+
+class WalkPlan:
+    """Plan stored as two structured arrays (one row per week / per session).
+
+    Each week row takes 12 bytes and each session row 8; titles, session
+    descriptions and tables are built only when asked for.
+    """
+
+    __slots__ = ("weeks", "sessions")
+
+    def __init__(self, weeks, sessions):
+        self.weeks = weeks
+        self.sessions = sessions
+
+    def __len__(self):
+        return len(self.weeks)
+
+    @property
+    def nbytes(self):
+        return self.weeks.nbytes + self.sessions.nbytes
+
+    @classmethod
+    def from_weeks(cls, weeks):
+        """Collect (week_row, sessions) pairs from iter_plan_weeks into one plan."""
+        week_rows, blocks = [], []
+        for week_row, sessions in weeks:
+            week_rows.append(week_row)
+            blocks.append(sessions)
+        return cls(
+            np.array(week_rows, dtype=WEEK_DTYPE),
+            np.concatenate(blocks) if blocks else np.zeros(0, dtype=SESSION_DTYPE),
+        )
+
+    def week_sessions(self, i):
+        week = self.weeks["week"][i]
+        lo, hi = np.searchsorted(self.sessions["week"], [week, week + 1])
+        return self.sessions[lo:hi]
+
+    def iter_weeks(self):
+        for i in range(len(self.weeks)):
+            yield self.weeks[i], self.week_sessions(i)
+
+    # ---- lazy rendering ----
+    @staticmethod
+    def week_label(week, deload=False):
+        return f"{int(week)}주차(회복)" if deload else f"{int(week)}주차"
+
+    @classmethod
+    def format_week_title(cls, w):
+        return (f"{cls.week_label(w['week'], w['deload'])} — 주간 총 {w['total_minutes']}분, "
+                f"1회 약 {w['session_minutes']}분, 세션수 {w['sessions']}")
+
+    def week_title(self, i):
+        return self.format_week_title(self.weeks[i])
+
+    @staticmethod
+    def session_text(session):
+        main = INTENSITY_MAIN_TEXT[int(session["intensity"])](int(session["minutes"]))
+        return f"워밍업 5분 → {main} → 쿨다운 5분"
+
+    def digest(self):
+        """Content hash, used as the cache key for rendered output."""
+        return hashlib.blake2b(self.weeks.tobytes() + self.sessions.tobytes(), digest_size=16).hexdigest()
+
+    def to_markdown(self):
+        """The whole plan as one markdown block (one Streamlit element)."""
+        parts = []
+        for week_row, sessions in self.iter_weeks():
+            parts.append(f"### {self.format_week_title(week_row)}\n")
+            parts.extend(f"- 세션 {s['session']}: {s['minutes']}분 — {self.session_text(s)}" for s in sessions)
+            parts.append("\n---\n")
+        return "\n".join(parts)
+
+    def to_records(self):
+        """The nested list-of-dicts layout generate_personalized_4week used to return."""
+        return [
+            {
+                "주차": self.week_label(w["week"], w["deload"]),
+                "주간총시간(분)": int(w["total_minutes"]),
+                "1회시간(분)": int(w["session_minutes"]),
+                "세션수": int(w["sessions"]),
+                "세부세션": [
+                    {"세션번호": int(s["session"]), "세션시간(분)": int(s["minutes"]), "내용": self.session_text(s)}
+                    for s in self.week_sessions(i)
+                ],
+            }
+            for i, w in enumerate(self.weeks)
+        ]
+
+    def to_frame(self):
+        """One row per session, for display or CSV export."""
+        s = self.sessions
+        deload_weeks = set(self.weeks["week"][self.weeks["deload"]].tolist())
+        return pd.DataFrame({
+            "주차": [self.week_label(w, w in deload_weeks) for w in s["week"].tolist()],
+            "세션번호": s["session"].astype(np.int64),
+            "세션시간(분)": s["minutes"].astype(np.int64),
+            "내용": [self.session_text(row) for row in s],
+        })
+
+
+def iter_plan_weeks(goal, weekly_minutes, sessions_per_week, intensity_pref, n_weeks=4,
+                    deload_every=None, max_progress_weeks=None, deload_factor=DELOAD_FACTOR):
+    """Yield (week_row, sessions) one week at a time.
+
+    week_row is a WEEK_DTYPE record and sessions a SESSION_DTYPE array, so a
+    52-week program can be streamed to CSV or the UI without building it all.
+    Deload weeks scale the volume by deload_factor and use easy sessions.
+    """
+    start, step = WEEK_FACTOR_BY_GOAL.get(goal, DEFAULT_WEEK_FACTOR)
+    intensity = session_intensity(goal, intensity_pref)
+    for w, progress, deload in iter_week_schedule(n_weeks, deload_every, max_progress_weeks):
+        factor = start + step * progress
+        if deload:
+            factor *= deload_factor
+        week_total = int(round(weekly_minutes * factor))
+        per_session = max(MIN_SESSION_MINUTES, int(round(week_total / sessions_per_week)))
+        sessions = np.zeros(sessions_per_week, dtype=SESSION_DTYPE)
+        sessions["week"] = w
+        sessions["session"] = np.arange(1, sessions_per_week + 1)
+        sessions["minutes"] = per_session
+        sessions["intensity"] = INTENSITY_EASY if deload else intensity
+        yield np.array((w, week_total, per_session, sessions_per_week, deload), dtype=WEEK_DTYPE), sessions
+
+
+def iter_plan_rows(weeks):
+    """CSV rows (PLAN_CSV_HEADER order) from (week_row, sessions) pairs, rendered lazily."""
+    for week_row, sessions in weeks:
+        label = WalkPlan.week_label(week_row["week"], week_row["deload"])
+        for s in sessions:
+            yield label, int(s["session"]), int(s["minutes"]), WalkPlan.session_text(s)
+
+
+def build_plan(goal, weekly_minutes, sessions_per_week, intensity_pref, n_weeks=4, **program):
+    """Materialized plan; with the default 4 weeks it matches generate_personalized_4week.
+
+    program takes the iter_plan_weeks options, e.g. **PROGRAM_PRESETS[52].
+    """
+    return WalkPlan.from_weeks(
+        iter_plan_weeks(goal, weekly_minutes, sessions_per_week, intensity_pref, n_weeks, **program)
+    )
+
+
+def build_plan_table(goal, weekly_minutes, sessions_per_week, intensity_pref, n_weeks=4,
+                     deload_every=None, max_progress_weeks=None, deload_factor=DELOAD_FACTOR):
+    """Plans for many members at once as one long table (one row per session).
+
+    Arguments are per-member arrays (sessions_per_week / intensity_pref may be
+    scalars). Numbers match build_plan member by member; the description text
+    is rendered once per distinct (intensity, minutes) pair.
+    Returns member (position in the inputs), 주차, 세션번호, 세션시간(분), 내용.
+    """
+    goal = np.asarray(goal, dtype=object)
+    n = len(goal)
+    weekly = np.asarray(weekly_minutes, dtype=np.float64)
+    spw = np.broadcast_to(np.asarray(sessions_per_week, dtype=np.int64), (n,))
+    prefs = np.broadcast_to(np.asarray(intensity_pref, dtype=object), (n,))
+
+    schedule = list(iter_week_schedule(n_weeks, deload_every, max_progress_weeks))
+    deload = np.array([d for _, _, d in schedule], dtype=bool)
+    labels = np.array([WalkPlan.week_label(w, d) for w, _, d in schedule], dtype=object)
+
+    # per-goal weekly factors, computed exactly like iter_plan_weeks
+    goal_codes, goal_uniques = pd.factorize(pd.Series(goal), sort=False)
+    factors = np.empty((len(goal_uniques), len(schedule)))
+    for g, name in enumerate(goal_uniques):
+        start, step = WEEK_FACTOR_BY_GOAL.get(name, DEFAULT_WEEK_FACTOR)
+        for j, (_, progress, is_deload) in enumerate(schedule):
+            factor = start + step * progress
+            factors[g, j] = factor * deload_factor if is_deload else factor
+
+    week_total = round_half_even(weekly[:, None] * factors[goal_codes])
+    per_session = np.maximum(MIN_SESSION_MINUTES, round_half_even(week_total / spw[:, None])).astype(np.int64)
+    base_intensity = np.array([session_intensity(g, p) for g, p in zip(goal, prefs)], dtype=np.int64)
+    intensity = np.where(deload[None, :], INTENSITY_EASY, base_intensity[:, None])
+
+    # expand (member, week) cells into sessions
+    counts = np.repeat(spw, len(schedule))
+    total = int(counts.sum())
+    starts = np.cumsum(counts) - counts
+    session_no = np.arange(total) - np.repeat(starts, counts) + 1
+    week_idx = np.repeat(np.tile(np.arange(len(schedule)), n), counts)
+    minutes = np.repeat(per_session.ravel(), counts)
+    codes = np.repeat(intensity.ravel(), counts)
+
+    pair, inverse = np.unique((codes << 32) + minutes, return_inverse=True)
+    texts = np.array(
+        [f"워밍업 5분 → {INTENSITY_MAIN_TEXT[int(k) >> 32](int(k) & 0xFFFFFFFF)} → 쿨다운 5분" for k in pair],
+        dtype=object,
+    )
+    return pd.DataFrame({
+        "member": np.repeat(np.repeat(np.arange(n), len(schedule)), counts),
+        "주차": labels[week_idx],
+        "세션번호": session_no,
+        "세션시간(분)": minutes,
+        "내용": texts[inverse.ravel()],
+    })
+
+
+# ------------------ Result cache ------------------
+
+class LRUCache:
+    """Bounded least-recently-used cache with an optional TTL (seconds).
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        now = self.clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (self.ttl is None or now - entry[0] < self.ttl):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._data[key] = (now, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+def recommendation_key(age, weight, height, activity_level, goal, conditions,
+                       weekly_target_override=None, matcher=CONDITION_MATCHER):
+    """Normalized inputs that fully determine compute_recommendation's result.
+
+    Age breakpoints are whole years, so floor(age) is exact; BMI is already
+    rounded to 0.1; conditions collapse to the matched rule sequence.
+    """
+    bmi = calc_bmi(weight, height) if weight and height else None
+    if weekly_target_override is not None and weekly_target_override <= 0:
+        weekly_target_override = None
+    return (math.floor(age), bmi, activity_level, goal, matcher.canonical(conditions), weekly_target_override)
+
+
+def plan_key(goal, weekly_minutes, sessions_per_week, intensity_pref, n_weeks=4):
+    """Inputs that fully determine a generated plan (age/weight/height are unused)."""
+    return (goal, int(weekly_minutes), int(sessions_per_week), intensity_pref, int(n_weeks))
+
+
+# ------------------ Helpers ------------------
+
+def round_half_even(values, decimals=0):
+    """Array rounding that matches Python's round() exactly.
+
+    np.round scales by 10**decimals first, which can land a value like 0.15
+    on an exact .5 and round it differently from round(0.15, 1); those few
+    ties are recomputed with round().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, decimals)
+    if decimals == 0:
+        return rounded
+    scaled = values * 10 ** decimals
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in ties:
+        rounded[i] = round(float(values[i]), decimals)
+    return rounded
+
+
+def condition_adjustments_by_unique(conditions, adjust):
+    """Run a scalar conditions parser once per distinct string and broadcast back."""
+    codes, uniques = pd.factorize(pd.Series(conditions).fillna(""), sort=False)
+    parsed = [adjust(c) for c in uniques]
+    warnings = np.array([w for w, _ in parsed] or [""], dtype=object)
+    factors = np.array([f for _, f in parsed] or [1.0], dtype=np.float64)
+    return warnings[codes], factors[codes]
+
+
+# ------------------ Modifiers (scalar) ------------------
+
+def calc_bmi(weight_kg, height_cm):
+    if height_cm <= 0:
+        return None
+    h = height_cm / 100.0
+    return round(weight_kg / (h * h), 1)
+
+
+def age_modifier(age):
+    return AGE_MODIFIER_TABLE(age)
+
+
+def bmi_modifier(bmi, goal):
+    if bmi is None or goal != "체중 감량":
+        return 1.0
+    return WEIGHT_LOSS_BMI_TABLE(bmi)
+
+
+def bmi_category(bmi):
+    if bmi is None:
+        return BMI_UNKNOWN
+    return BMI_CATEGORY_TABLE(bmi)
+
+
+def activity_modifier(activity_level):
+    return ACTIVITY_MODIFIERS.get(activity_level, 1.0)
+
+
+# ------------------ Modifiers (arrays) ------------------
+
+def calc_bmi_array(weight_kg, height_cm):
+    weight_kg = np.asarray(weight_kg, dtype=np.float64)
+    height_cm = np.asarray(height_cm, dtype=np.float64)
+    valid = (weight_kg > 0) & (height_cm > 0)
+    h = np.where(valid, height_cm, np.nan) / 100.0
+    return round_half_even(np.where(valid, weight_kg, np.nan) / (h * h), 1)
+
+
+def age_modifier_array(age):
+    return AGE_MODIFIER_TABLE.evaluate(age)
+
+
+def bmi_modifier_array(bmi, goal):
+    bmi = np.asarray(bmi, dtype=np.float64)
+    loss = np.asarray(goal, dtype=object) == "체중 감량"
+    return np.where(loss & ~np.isnan(bmi), WEIGHT_LOSS_BMI_TABLE.evaluate(bmi), 1.0)
+
+
+def bmi_category_array(bmi):
+    bmi = np.asarray(bmi, dtype=np.float64)
+    return np.where(np.isnan(bmi), BMI_UNKNOWN, BMI_CATEGORY_TABLE.evaluate(bmi))
+
+
+def activity_modifier_array(activity_level):
+    return pd.Series(activity_level).map(ACTIVITY_MODIFIERS).fillna(1.0).to_numpy(dtype=np.float64)
+
+
+def base_weekly_array(goal, override=None):
+    base = pd.Series(goal).map(BASE_WEEKLY_BY_GOAL).fillna(DEFAULT_BASE_WEEKLY).to_numpy(dtype=np.float64)
+    if override is not None:
+        override = np.nan_to_num(np.asarray(override, dtype=np.float64))
+        base = np.where(override > 0, override, base)
+    return base
+
+
+# ------------------ Cohort API ------------------
+
+def compute_recommendations(members, condition_adjust=CONDITION_MATCHER):
+    """Batch version of compute_recommendation for a whole member table.
+
+    members needs age, weight, height, activity_level, goal and conditions
+    columns (weekly_target_override is optional). condition_adjust is the
+    scalar conditions parser (the shared ConditionMatcher by default); it is
+    called once per distinct conditions string.
+    Returns a copy of members with weekly_minutes, daily_minutes, bmi,
+    bmi_category, condition_warning and condition_factor columns added.
+    """
+    bmi = calc_bmi_array(members["weight"].fillna(0), members["height"].fillna(0))
+    warnings, cond_factor = condition_adjustments_by_unique(members["conditions"], condition_adjust)
+    override = members["weekly_target_override"] if "weekly_target_override" in members else None
+
+    weekly = (
+        base_weekly_array(members["goal"], override)
+        * age_modifier_array(members["age"])
+        * bmi_modifier_array(bmi, members["goal"])
+        * activity_modifier_array(members["activity_level"])
+        * cond_factor
+    )
+    weekly = np.maximum(MIN_WEEKLY_MINUTES, round_half_even(weekly)).astype(np.int64)
+    daily = round_half_even(weekly / 7.0).astype(np.int64)
+
+    return members.assign(
+        weekly_minutes=weekly,
+        daily_minutes=daily,
+        bmi=bmi,
+        bmi_category=bmi_category_array(bmi),
+        condition_warning=warnings,
+        condition_factor=cond_factor,
+    )
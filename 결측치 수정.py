@@ -1,4 +1,5 @@
 import pandas as pd
+from imputation import StreamingImputer
 
 data = {
     "name": ["홍길동", "김철수", "이영희", "박민수"],
@@ -14,9 +15,11 @@ print(df)
 print("\n🔍 결측치 개수:")
 print(df.isnull().sum())
 
-# 결측치를 평균값으로 채우기
-df['income'].fillna(df['income'].mean(), inplace=True)
-df['age'].fillna(df['age'].mean(), inplace=True)
+# 결측치를 평균값으로 채우기 (1단계: 평균 누적, 2단계: 채우기)
+# 큰 파일은 imputer.fit_csv(경로) / imputer.transform_csv(경로, 저장경로)로 묶음 단위 처리
+imputer = StreamingImputer(["income", "age"], strategy="mean")
+imputer.partial_fit(df)
+df = imputer.transform(df)
 
 print("\n✅ 결측치 채운 후:")
 print(df)
@@ -1,4 +1,8 @@
 import streamlit as st
+from tax_tables import get_table
+
+# 세율표 (tax_tables.json)
+INCOME_LEVEL_TABLE = get_table("income_level")
 
 st.title("💰 소득세 계산기")
 st.write("입력한 소득에 따라 예상 세금과 소득 수준을 계산합니다.")
@@ -6,24 +10,14 @@ st.write("입력한 소득에 따라 예상 세금과 소득 수준을 계산합
 # 사용자 입력
 income = st.number_input("소득을 입력하세요 (단위: 원)", min_value=0, step=1000000, value=55000000)
 
-# 세금 계산
-if income <= 12000000:
-    level = "저소득층"
-    tax_rate = 0.06
-elif income <= 46000000:
-    level = "중간소득층"
-    tax_rate = 0.15
-elif income <= 88000000:
-    level = "고소득층"
-    tax_rate = 0.24
-else:
-    level = "초고소득층"
-    tax_rate = 0.35
-
-tax = income * tax_rate
+# 세금 계산 (1,200만 / 4,600만 / 8,800만 원 구간)
+level = INCOME_LEVEL_TABLE.label(income)
+tax = float(INCOME_LEVEL_TABLE.flat_tax(income))
+progressive_tax = float(INCOME_LEVEL_TABLE.progressive_tax(income))
 
 # 결과 표시
 st.subheader("📊 계산 결과")
 st.write(f"**소득 수준:** {level}")
 st.write(f"**소득 금액:** {income:,.0f} 원")
 st.write(f"**예상 세금:** {tax:,.0f} 원")
+st.write(f"**누진 계산 세금:** {progressive_tax:,.0f} 원")
@@ -1,6 +1,9 @@
 import streamlit as st
-import csv
-import io
+from tax_export import iter_csv_chunks
+from tax_tables import get_table
+
+# 세율표 (tax_tables.json)
+FLAT_10_TABLE = get_table("flat_10")
 
 st.set_page_config(page_title="간단한 소득세 계산기", page_icon="💰")
 st.title("💰 소득의 10% 세금 계산기")
@@ -10,21 +13,18 @@ st.write("입력한 소득의 10%를 세금으로 계산하고, 결과를 CSV로
 # 세금 계산 함수
 # -------------------------------
 def calculate_tax(income):
-    """소득의 10%를 세금으로 계산"""
-    tax = income * 0.10
-    after_tax_income = income - tax
+    """소득의 10%를 세금으로 계산 (정수 원 단위, 원 미만 절사)"""
+    tax = int(FLAT_10_TABLE.flat_tax_won(income))
+    after_tax_income = int(income) - tax
     return tax, after_tax_income
 
 # -------------------------------
 # CSV 저장 함수 (Streamlit용)
 # -------------------------------
 def create_csv(income, tax, after_tax_income):
-    """CSV 데이터를 메모리에 생성"""
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["소득", "세금", "세후 소득"])
-    writer.writerow([income, tax, after_tax_income])
-    return output.getvalue().encode("utf-8")
+    """CSV 데이터를 메모리에 생성 (조각 단위로 인코딩해 한 번만 합침)"""
+    rows = [[income, tax, after_tax_income]]
+    return b"".join(iter_csv_chunks(rows, header=["소득", "세금", "세후 소득"]))
 
 # -------------------------------
 # 사용자 입력
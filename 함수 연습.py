@@ -1,29 +1,41 @@
 import streamlit as st
-import csv
-import os
+from tax_export import iter_csv_chunks
+from tax_tables import get_table
+from taxpayer_db import TaxpayerDB
+from taxpayer_registry import TaxpayerRegistry
+
+# 세율표 (tax_tables.json)
+FLAT_10_TABLE = get_table("flat_10")
+INCOME_LEVEL_TABLE = get_table("income_level")
 
 # 세금 계산 함수
 def calculate_tax(income):
-    """소득의 10%를 세금으로 계산"""
-    return income * 0.1
+    """소득의 10%를 세금으로 계산 (정수 원 단위, 원 미만 절사)"""
+    return int(FLAT_10_TABLE.flat_tax_won(income))
 
-# CSV 파일 저장 함수
-def save_to_csv(taxpayer):
-    filename = "tax_results.csv"
-    file_exists = os.path.isfile(filename)
+# 납세자 레지스트리 (프로세스당 하나를 모든 세션이 공유, 같은 이름은 최신 결과로 갱신)
+@st.cache_resource
+def get_registry():
+    return TaxpayerRegistry("tax_results.csv", fieldnames=["name", "income", "tax"])
+
+# SQLite 저장소 (같은 이름은 최신 결과로 덮어쓰기)
+@st.cache_resource
+def get_db():
+    return TaxpayerDB("tax_results.db")
 
-    with open(filename, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["name", "income", "tax"])
-        # 파일이 처음 생성될 때 헤더 추가
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(taxpayer)
+# CSV 파일 저장 함수 (변경 로그에 한 줄 추가, 주기적으로 tax_results.csv를 최신 상태로 압축)
+def save_to_csv(taxpayer):
+    registry = get_registry()
+    registry.upsert(taxpayer)
+    registry.flush()  # 한 명씩 저장하는 화면이므로 버퍼에 남겨 두지 않음
 
 # Streamlit 앱
 st.title("💬 납세자 세금 계산 챗봇")
 
 st.write("안녕하세요! 납세자 정보를 입력하면 세금을 계산해드릴게요 😊")
 
+backend = st.radio("저장 방식", ["CSV", "SQLite"], horizontal=True)
+
 # 사용자 입력
 name = st.text_input("납세자 이름을 입력하세요:")
 income = st.number_input("소득을 입력하세요 (원)", min_value=0.0, step=100000.0)
@@ -38,29 +50,56 @@ if st.button("세금 계산하기"):
         tax = calculate_tax(income)
         st.success(f"💰 {name}님의 세금은 **{tax:,.0f}원** 입니다!")
 
-        # CSV 저장
         taxpayer = {"name": name, "income": income, "tax": tax}
-        save_to_csv(taxpayer)
-        st.info("✅ 세금 계산 결과가 CSV 파일(tax_results.csv)에 저장되었습니다.")
+        if backend == "SQLite":
+            get_db().upsert(taxpayer)
+            st.info("✅ 세금 계산 결과가 데이터베이스(tax_results.db)에 저장되었습니다.")
+        else:
+            # CSV 저장
+            save_to_csv(taxpayer)
+            st.info("✅ 세금 계산 결과가 CSV 파일(tax_results.csv)에 저장되었습니다.")
+
+# 이름으로 저장된 기록 찾기
+search_name = st.text_input("저장된 기록을 찾을 이름:")
+if search_name:
+    if backend == "SQLite":
+        record = get_db().get(search_name)
+        records = [record] if record else []
+    else:
+        record = get_registry().get(search_name)
+        records = [record] if record else []
+    if records:
+        st.table(records)
+    else:
+        st.info(f"{search_name}님의 저장된 기록이 없습니다.")
 
 # 저장된 데이터 확인
 if st.checkbox("저장된 납세자 목록 보기"):
-    if os.path.exists("tax_results.csv"):
-        st.subheader("📄 저장된 세금 계산 내역")
-        st.dataframe(
-            st.experimental_data_editor(
-                st.session_state.get("tax_data", None)
-            )
-            if "tax_data" in st.session_state
-            else st.dataframe(st.data_editor)
-        )
+    if backend == "SQLite":
+        db = get_db()
+        st.subheader(f"📄 저장된 세금 계산 내역 (총 {db.count():,}명, 최근 100명)")
+        st.dataframe(db.recent(limit=100), use_container_width=True)
 
-        with open("tax_results.csv", "r", encoding="utf-8") as f:
-            st.download_button(
-                "📥 CSV 파일 다운로드",
-                data=f,
-                file_name="tax_results.csv",
-                mime="text/csv"
-            )
+        st.subheader("📊 소득 구간별 합계")
+        st.dataframe(db.bracket_totals(INCOME_LEVEL_TABLE), use_container_width=True)
+
+        low, high = st.slider("소득 범위로 찾기 (백만 원)", 0, 500, (0, 100))
+        st.dataframe(db.by_income(low * 1000000, high * 1000000), use_container_width=True)
+    elif len(get_registry()) > 0:
+        registry = get_registry()
+        st.subheader(f"📄 저장된 세금 계산 내역 (총 {len(registry):,}명)")
+        records = registry.records()
+        st.dataframe(records, use_container_width=True)
+
+        # 압축은 레지스트리가 로그 크기를 보고 알아서 하므로, 다운로드는 위에서 읽은 최신 상태로 만듦
+        csv_bytes = b"".join(iter_csv_chunks(
+            ([r.get(f) for f in registry.fieldnames] for r in records), header=registry.fieldnames
+        ))
+        st.download_button(
+            "📥 CSV 파일 다운로드",
+            data=csv_bytes,
+            file_name="tax_results.csv",
+            mime="text/csv"
+        )
     else:
         st.info("아직 저장된 납세자 데이터가 없습니다.")